@@ -0,0 +1,99 @@
+"""Benchmark and equivalence check: clean_html vs. the BeautifulSoup clean_html_soup.
+
+Usage: python benchmarks/bench_clean_html.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rss_alerts
+from rss_alerts import clean_html, clean_html_soup
+
+# Summaries in the shapes common feed generators produce
+CORPUS = [
+    # WordPress excerpt
+    '<p>Researchers disclosed a critical RCE in a popular CMS plugin &#8211; patch now.</p>\n'
+    '<p>The post <a rel="nofollow" href="https://example.com/rce/">Critical RCE in plugin</a> '
+    'appeared first on <a rel="nofollow" href="https://example.com">Example Security</a>.</p>',
+    # Medium: figure, image and long body
+    '<div class="medium-feed-item"><p class="medium-feed-image"><a href="https://medium.com/p/1">'
+    '<img src="https://cdn-images-1.medium.com/max/2600/1.png" width="2048"></a></p>'
+    '<p class="medium-feed-snippet">Bypassing a WAF with unicode normalization and a little patience&#x2026;</p>'
+    '<p class="medium-feed-link"><a href="https://medium.com/p/1">Continue reading on Medium »</a></p></div>',
+    # GitHub release notes
+    '<h2>What&#39;s Changed</h2>\n<ul>\n'
+    + "".join(f'<li>Fix issue #{i} in the <code>parser</code> module by <a href="https://github.com/u{i}">@u{i}</a></li>\n'
+              for i in range(40))
+    + '</ul>\n<p><strong>Full Changelog</strong>: <a href="https://github.com/o/r/compare/v1...v2">v1...v2</a></p>',
+    # Plain text with entities
+    'Tom &amp; Jerry&nbsp;return in &quot;The Chase&quot; &mdash; 5 &lt; 6 &copy; 2024',
+    # Inline formatting
+    'Hello <b>world</b>, this is <i>inline</i> <em>formatting</em> with a <a href="/x">link</a>.',
+    # Script and style blocks that must not leak into the text
+    '<style>p { color: red; }</style><p>Visible text</p><script>var tracking = "hidden";</script><!-- comment -->',
+    # Long article body
+    "<div>" + "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.</p>\n" * 200 + "</div>",
+    # CDATA-style escaped HTML inside a description
+    '&lt;p&gt;Escaped markup stays as text&lt;/p&gt;',
+    # Malformed markup
+    '<p>Unclosed <b>bold <i>and italic</p> trailing text <br> more',
+    # Non-ASCII
+    '<p>Ein Überblick über die Sicherheitslücke – mit Beispielen 🔒</p>',
+    # Long attributes push text across the 1024-character feed() chunks
+    *(f'<p><a href="https://example.com/{"x" * n}">Read more</a> Breaking news today. More text follows here.</p>'
+      for n in range(900, 1031, 13)),
+    '<p>' + "A long unbroken paragraph of plain text without any markup at all. " * 40 + '</p>',
+    # Empty and whitespace-only
+    '',
+    '   <p>   </p>  ',
+]
+
+def reference(raw_html, max_chars=280):
+    text = clean_html_soup(raw_html)
+    if len(text) > max_chars:
+        text = text[:max_chars - 3] + "..."
+    return text
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    mismatches = 0
+    for raw_html in CORPUS:
+        expected = reference(raw_html)
+        rss_alerts.clean_html_cache.clear()
+        actual = clean_html(raw_html, max_chars=280)
+        if actual != expected:
+            mismatches += 1
+            print(f"MISMATCH\n  expected: {expected!r}\n  actual:   {actual!r}")
+    print(f"Equivalence: {len(CORPUS) - mismatches}/{len(CORPUS)} summaries identical\n")
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for raw_html in CORPUS:
+            reference(raw_html)
+    soup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        rss_alerts.clean_html_cache.clear()
+        for raw_html in CORPUS:
+            clean_html(raw_html, max_chars=280)
+    cold_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for raw_html in CORPUS:
+            clean_html(raw_html, max_chars=280)
+    warm_time = time.perf_counter() - start
+
+    calls = iterations * len(CORPUS)
+    print(f"{calls} calls over {len(CORPUS)} summaries:")
+    print(f"  soup          {soup_time / calls * 1e6:8.1f} us/call")
+    print(f"  fast (cold)   {cold_time / calls * 1e6:8.1f} us/call  {soup_time / cold_time:6.1f}x")
+    print(f"  fast (cached) {warm_time / calls * 1e6:8.1f} us/call  {soup_time / warm_time:6.1f}x")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""Offline end-to-end benchmark: rss_checker + sender_worker against a local feed farm.
+
+A separate process serves N synthetic RSS / Atom / YouTube feeds (configurable
+size, latency, error rate and ETag/304 support) and a mock Discord webhook that
+sends X-RateLimit-* headers and answers 429 when a webhook's bucket is empty.
+The bot runs in this process in a temporary working directory, so the numbers
+(including peak RSS) are the bot's own.
+
+Usage: python benchmarks/bench_cycle.py --feeds 200 --cycles 2 --output bench_results.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import random
+import re
+import resource
+import sys
+import tempfile
+import time
+from email.utils import formatdate
+
+import aiohttp
+from aiohttp import web
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+WEBHOOK_BUCKET_SIZE = 5  # Discord webhooks allow roughly 5 requests per 2 seconds
+WEBHOOK_BUCKET_WINDOW = 2.0
+
+# ---------------------------------------------------------------------------
+# Feed farm and mock webhook (runs in a child process)
+# ---------------------------------------------------------------------------
+
+def build_feed(feed_id, kind, items, item_size, base_url, started):
+    filler = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (item_size // 56 + 1))[:item_size]
+    entries = []
+    for i in range(items):
+        published = started - 600 * i
+        link = f"{base_url}/article/{feed_id}/{i}"
+        if kind == "rss":
+            entries.append(
+                f"<item><title>Feed {feed_id} item {i}</title><link>{link}</link>"
+                f"<guid>{link}</guid><pubDate>{formatdate(published)}</pubDate>"
+                f"<description>&lt;p&gt;{filler}&lt;/p&gt;&lt;img src=\"{base_url}/img/{feed_id}.png\"&gt;</description></item>"
+            )
+        else:
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(published))
+            if kind == "youtube":
+                link = f"https://www.youtube.com/watch?v=f{feed_id}i{i}"
+            entries.append(
+                f"<entry><id>{link}</id><title>Feed {feed_id} item {i}</title>"
+                f"<link rel=\"alternate\" href=\"{link}\"/><published>{stamp}</published><updated>{stamp}</updated>"
+                f"<author><name>Author {feed_id}</name></author>"
+                f"<summary type=\"html\">&lt;p&gt;{filler}&lt;/p&gt;&lt;img src=\"{base_url}/img/{feed_id}.png\"&gt;</summary></entry>"
+            )
+    if kind == "rss":
+        return (f"<?xml version=\"1.0\"?><rss version=\"2.0\"><channel><title>Feed {feed_id}</title>"
+                f"<link>{base_url}</link>{''.join(entries)}</channel></rss>")
+    return (f"<?xml version=\"1.0\"?><feed xmlns=\"http://www.w3.org/2005/Atom\"><title>Feed {feed_id}</title>"
+            f"<id>{base_url}/feed/{feed_id}</id>{''.join(entries)}</feed>")
+
+def run_farm(port, args, ready):
+    started = time.time()
+    base_url = f"http://127.0.0.1:{port}"
+    rng = random.Random(args.seed)
+    kinds = ["rss", "atom", "youtube"]
+    feeds = {
+        i: build_feed(i, kinds[i % 3], args.items, args.item_size, base_url, started).encode()
+        for i in range(args.feeds)
+    }
+    conditional = {i for i in range(args.feeds) if rng.random() < args.not_modified_rate}
+    stats = {
+        "fetches": 0, "not_modified": 0, "errors": 0,
+        "webhook_requests": 0, "webhook_429s": 0, "deliveries": [], "served_at": {}
+    }
+    buckets = {}
+
+    async def feed(request):
+        feed_id = int(request.match_info["feed_id"])
+        stats["fetches"] += 1
+        await asyncio.sleep(args.latency_ms / 1000 * rng.uniform(0.5, 1.5))
+        if rng.random() < args.error_rate:
+            stats["errors"] += 1
+            return web.Response(status=503)
+        stats["served_at"][feed_id] = time.time()
+        etag = f"\"feed-{feed_id}\""
+        if feed_id in conditional:
+            if request.headers.get("If-None-Match") == etag:
+                stats["not_modified"] += 1
+                return web.Response(status=304)
+            return web.Response(body=feeds[feed_id], content_type="application/xml", headers={"ETag": etag})
+        return web.Response(body=feeds[feed_id], content_type="application/xml")
+
+    async def webhook(request):
+        hook_id = request.match_info["hook_id"]
+        stats["webhook_requests"] += 1
+        now = time.monotonic()
+        bucket = buckets.setdefault(hook_id, {"remaining": WEBHOOK_BUCKET_SIZE, "reset_at": now + WEBHOOK_BUCKET_WINDOW})
+        if now >= bucket["reset_at"]:
+            bucket.update(remaining=WEBHOOK_BUCKET_SIZE, reset_at=now + WEBHOOK_BUCKET_WINDOW)
+        if bucket["remaining"] <= 0:
+            stats["webhook_429s"] += 1
+            return web.json_response(
+                {"message": "You are being rate limited.", "retry_after": bucket["reset_at"] - now, "global": False},
+                status=429
+            )
+        bucket["remaining"] -= 1
+        payload = await request.json()
+        received = time.time()
+        text = payload.get("content", "") + " ".join(embed.get("url", "") for embed in payload.get("embeds", []))
+        # Article links carry /article/<feed>/<item>; YouTube links carry v=f<feed>i<item>
+        for feed_id in re.findall(r"/article/(\d+)/\d+|v=f(\d+)i\d+", text):
+            feed_id = int(feed_id[0] or feed_id[1])
+            served = stats["served_at"].get(feed_id)
+            stats["deliveries"].append(received - served if served else None)
+        return web.Response(status=204, headers={
+            "X-RateLimit-Limit": str(WEBHOOK_BUCKET_SIZE),
+            "X-RateLimit-Remaining": str(bucket["remaining"]),
+            "X-RateLimit-Reset-After": f"{bucket['reset_at'] - now:.3f}"
+        })
+
+    async def get_stats(request):
+        return web.json_response({k: v for k, v in stats.items() if k != "served_at"})
+
+    async def main():
+        app = web.Application(client_max_size=1024 ** 2 * 8)
+        app.router.add_get("/feed/{feed_id}", feed)
+        app.router.add_post("/webhook/{hook_id}", webhook)
+        app.router.add_get("/stats", get_stats)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+# ---------------------------------------------------------------------------
+# Bot side
+# ---------------------------------------------------------------------------
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+async def run_bot(args, base_url):
+    import rss_alerts
+
+    rss_alerts.DISCORD_WEBHOOK_URL = None
+    config = {
+        f"{base_url}/feed/{i}": {
+            # Each feed fans out to --subscribers webhooks but is only fetched once per cycle
+            "subscriptions": [
+                {"webhook": f"{base_url}/webhook/{(i + n) % args.webhooks}", "category": "Bench"}
+                for n in range(args.subscribers)
+            ],
+            # Keep every feed due each cycle so consecutive cycles exercise the 304 / hash paths
+            "poll_interval": 0,
+            "min_interval": 0
+        }
+        for i in range(args.feeds)
+    }
+    with open(rss_alerts.CONFIG_FILE, "w") as f:
+        json.dump(config, f)
+
+    cycles = []
+    cycles_done = asyncio.Event()
+    original_check = rss_alerts.check_due_feeds
+
+    async def timed_check(feeds, due_urls, seen):
+        start = time.monotonic()
+        await original_check(feeds, due_urls, seen)
+        wall = time.monotonic() - start
+        cycles.append({"feeds": len(due_urls), "wall_time": wall, "fetches_per_sec": len(due_urls) / wall if wall else None})
+        if len(cycles) >= args.cycles:
+            cycles_done.set()
+            await asyncio.Event().wait()  # Park the checker; delivery keeps running
+
+    rss_alerts.check_due_feeds = timed_check
+    bench_start = time.time()
+    tasks = [asyncio.create_task(rss_alerts.rss_checker()), asyncio.create_task(rss_alerts.sender_worker())]
+    try:
+        await asyncio.wait_for(cycles_done.wait(), args.timeout)
+    except asyncio.TimeoutError:
+        logging.warning("Timed out before all cycles finished")
+
+    # Wait for the delivery queue and lanes to drain
+    async with aiohttp.ClientSession() as client:
+        deadline = time.monotonic() + args.timeout
+        last_count, last_delivery = -1, time.time()
+        while time.monotonic() < deadline:
+            async with client.get(f"{base_url}/stats") as resp:
+                stats = await resp.json()
+            count = len(stats["deliveries"])
+            if count != last_count:
+                last_count, last_delivery = count, time.time()
+            elif len(rss_alerts.get_delivery_queue()) == 0 and time.time() - last_delivery > args.coalesce_window + 3:
+                break
+            await asyncio.sleep(0.5)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for lane_queue, lane_task in list(rss_alerts.webhook_lanes.values()):
+        lane_task.cancel()
+    await rss_alerts.close_session()
+    return cycles, stats, last_delivery - bench_start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feeds", type=int, default=200)
+    parser.add_argument("--items", type=int, default=20, help="entries per feed")
+    parser.add_argument("--item-size", type=int, default=500, help="summary characters per entry")
+    parser.add_argument("--latency-ms", type=float, default=50, help="mean feed response latency")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="fraction of feed requests answered 503")
+    parser.add_argument("--not-modified-rate", type=float, default=0.5, help="fraction of feeds supporting ETag/304")
+    parser.add_argument("--webhooks", type=int, default=20)
+    parser.add_argument("--subscribers", type=int, default=1, help="webhooks subscribed to each feed")
+    parser.add_argument("--cycles", type=int, default=2)
+    parser.add_argument("--coalesce-window", type=float, default=0.5)
+    parser.add_argument("--max-fetches", type=int, default=20, help="MAX_CONCURRENT_FETCHES for the bot")
+    parser.add_argument("--per-host-fetches", type=int, default=20,
+                        help="MAX_FETCHES_PER_HOST for the bot; every farm feed shares one host")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    ready = multiprocessing.Event()
+    farm = multiprocessing.Process(target=run_farm, args=(args.port, args, ready), daemon=True)
+    farm.start()
+    if not ready.wait(30):
+        sys.exit("Feed farm failed to start")
+
+    # rss_alerts reads its tunables at import time
+    os.environ["COALESCE_WINDOW"] = str(args.coalesce_window)
+    os.environ["MAX_CONCURRENT_FETCHES"] = str(args.max_fetches)
+    os.environ["MAX_FETCHES_PER_HOST"] = str(args.per_host_fetches)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            cycles, stats, delivery_time = asyncio.run(run_bot(args, f"http://127.0.0.1:{args.port}"))
+        finally:
+            farm.terminate()
+
+    latencies = [latency for latency in stats["deliveries"] if latency is not None]
+    deliveries = len(stats["deliveries"])
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "params": {k: v for k, v in vars(args).items() if k not in ("output", "verbose")},
+        "cycles": cycles,
+        "feed_fetches": stats["fetches"],
+        "feed_errors": stats["errors"],
+        "not_modified": stats["not_modified"],
+        "deliveries": deliveries,
+        "webhook_requests": stats["webhook_requests"],
+        "webhook_429s": stats["webhook_429s"],
+        "deliveries_per_sec": deliveries / delivery_time if delivery_time > 0 else None,
+        "delivery_latency_p50": percentile(latencies, 50),
+        "delivery_latency_p99": percentile(latencies, 99),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+    with open(output, "w") as f:
+        json.dump(results, f, indent=4)
+
+    for i, cycle in enumerate(cycles, 1):
+        print(f"cycle {i}: {cycle['feeds']} feeds in {cycle['wall_time']:.2f}s ({cycle['fetches_per_sec']:.1f} fetches/s)")
+    print(f"deliveries: {deliveries} items in {stats['webhook_requests']} requests "
+          f"({stats['webhook_429s']} x 429), {results['deliveries_per_sec'] or 0:.1f} items/s")
+    if latencies:
+        print(f"delivery latency: p50 {results['delivery_latency_p50']:.2f}s, p99 {results['delivery_latency_p99']:.2f}s")
+    print(f"peak RSS: {results['peak_rss_mb']:.1f} MB")
+    print(f"results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Micro-benchmark: streaming OgImageScanner vs. the full BeautifulSoup path.
+
+Usage: python benchmarks/bench_og_image.py [page_kb] [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rss_alerts import OG_IMAGE_CHUNK_SIZE, OgImageScanner, find_og_image_soup
+
+def build_page(page_kb, head_meta=True):
+    meta = '<meta property="og:image" content="https://example.com/og.jpg">' if head_meta else ""
+    head = (
+        "<!DOCTYPE html><html><head><title>Article</title>"
+        + '<link rel="stylesheet" href="/style.css">' * 20
+        + meta
+        + "</head>"
+    )
+    paragraph = "<p>" + "Lorem ipsum dolor sit amet, <a href='/x'>consectetur</a> adipiscing elit. " * 10 + "</p>"
+    body = ["<body><nav><img src='/logo.png'></nav><article><h1>Title</h1><img src='/hero.jpg'>"]
+    while sum(len(part) for part in body) < page_kb * 1024:
+        body.append(paragraph)
+    body.append("</article></body></html>")
+    return (head + "".join(body)).encode()
+
+def run_streaming(page):
+    scanner = OgImageScanner()
+    for start in range(0, len(page), OG_IMAGE_CHUNK_SIZE):
+        scanner.feed_bytes(page[start:start + OG_IMAGE_CHUNK_SIZE])
+        if scanner.done:
+            break
+    return scanner.best_image(), scanner.bytes_read
+
+def run_soup(page):
+    return find_og_image_soup(page.decode()), len(page)
+
+def bench(name, func, page, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        image, bytes_read = func(page)
+    elapsed = (time.perf_counter() - start) / iterations
+    print(f"  {name:<10} {elapsed * 1000:8.2f} ms/page  {bytes_read / 1024:8.1f} KB read  -> {image}")
+    return elapsed
+
+def main():
+    page_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 2048
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    for head_meta in (True, False):
+        page = build_page(page_kb, head_meta)
+        label = "og:image in <head>" if head_meta else "no meta tag (<article><img> fallback)"
+        print(f"{len(page) / 1024:.0f} KB page, {label}:")
+        soup_time = bench("soup", run_soup, page, iterations)
+        stream_time = bench("streaming", run_streaming, page, iterations)
+        print(f"  speedup    {soup_time / stream_time:8.1f}x\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark and equivalence check: streaming parse_feed vs. a full feedparser parse.
+
+Checks that the streaming path returns the same compact records as feedparser
+on a corpus of RSS / Atom / YouTube shapes and that feeds with a pinned item or
+in oldest-first order still yield new entries on the next poll, then times both on feeds of growing
+size and reports peak allocations (tracemalloc).
+
+Usage: python benchmarks/bench_parse_feed.py [iterations]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from email.utils import formatdate
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import feedparser
+import rss_alerts
+from bench_cycle import build_feed
+from rss_alerts import parse_feed, select_entries, is_recent, compact_entry
+
+NOW = time.time()
+RFC822 = formatdate(NOW - 3600, usegmt=True)
+RFC822_OFFSET = time.strftime("%a, %d %b %Y %H:%M:%S +0200", time.gmtime(NOW - 1800 + 7200))
+ISO = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(NOW - 7200))
+ISO_OFFSET = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(NOW - 5400))
+OLD = formatdate(NOW - 3 * 86400, usegmt=True)
+
+CORPUS = {
+    "rss": f'''<?xml version="1.0"?><rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"
+xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:media="http://search.yahoo.com/mrss/"><channel><title>C</title>
+<item><title> Tom &amp; Jerry </title><link> https://ex.com/a?utm_source=x&amp;id=1 </link><pubDate>{RFC822}</pubDate>
+<description><![CDATA[<p>Hi <img src='https://ex.com/i.png'> there</p>]]></description><author>me@ex.com (Me)</author></item>
+<item><title>Guid link</title><guid>https://ex.com/b</guid><dc:creator>Dc Guy</dc:creator><pubDate>{RFC822_OFFSET}</pubDate>
+<content:encoded><![CDATA[<p>body <img src="https://ex.com/c.png"/></p>]]></content:encoded></item>
+<item><title>Media</title><link>https://ex.com/c</link><pubDate>{RFC822}</pubDate><enclosure url="https://ex.com/e.mp3"/>
+<media:thumbnail url="https://ex.com/t.jpg"/><description>plain &lt;b&gt;bold&lt;/b&gt;</description></item>
+<item><title>a &lt;b&gt;markup&lt;/b&gt; &amp;amp; title</title><link>https://ex.com/d</link><pubDate>{RFC822}</pubDate>
+<guid isPermaLink="false">abc</guid><description><![CDATA[<script>var x = 1;</script><p>Script stripped</p>]]></description></item>
+<item><title>No date</title><link>https://ex.com/e</link></item>
+<item><title>Old</title><link>https://ex.com/f</link><pubDate>{OLD}</pubDate></item>
+</channel></rss>''',
+    "atom": f'''<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>A</title>
+<entry><title type="html">A &amp;lt;b&amp;gt;</title><link href="https://ex.com/x"/><link rel="enclosure" href="https://ex.com/e.jpg"/>
+<published>{ISO}</published><content type="html">&lt;p&gt;cont&lt;/p&gt;</content></entry>
+<entry><title>Alternate</title><link rel="self" href="https://ex.com/self"/><link rel="alternate" type="text/html" href="https://ex.com/alt"/>
+<published>{ISO_OFFSET}</published><summary>sum</summary><author><name>Writer</name></author></entry>
+<entry><title>Updated only</title><link href="https://ex.com/u"/><updated>{ISO}</updated></entry>
+</feed>''',
+    "youtube": f'''<?xml version="1.0" encoding="UTF-8"?><feed xmlns:yt="http://www.youtube.com/xml/schemas/2015"
+xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom"><title>Chan</title>
+<entry><id>yt:video:abc</id><yt:videoId>abc</yt:videoId><title>Video</title>
+<link rel="alternate" href="https://www.youtube.com/watch?v=abc"/><author><name>Chan</name><uri>u</uri></author>
+<published>{ISO_OFFSET}</published><updated>{ISO}</updated><media:group><media:title>Video</media:title>
+<media:content url="https://www.youtube.com/v/abc" type="application/x-shockwave-flash"/>
+<media:thumbnail url="https://i1.ytimg.com/vi/abc/hqdefault.jpg" width="480" height="360"/>
+<media:description>Video description</media:description></media:group></entry></feed>''',
+    # Falls back to feedparser: RDF root, HTML entities, xhtml content
+    "rdf": f'''<?xml version="1.0"?><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel><title>R</title></channel>
+<item><title>RDF</title><link>https://ex.com/r</link><dc:date>{ISO}</dc:date></item></rdf:RDF>''',
+    "entities": f'''<rss version="2.0"><channel><item><title>Caf&eacute;&nbsp;news</title><link>https://ex.com/n</link>
+<pubDate>{RFC822}</pubDate></item></channel></rss>''',
+    "xhtml": f'''<feed xmlns="http://www.w3.org/2005/Atom"><entry><title>X</title><link href="https://ex.com/x"/>
+<published>{ISO}</published><content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>x</p></div></content></entry></feed>''',
+}
+
+def rss_items(items):
+    return "<rss version=\"2.0\"><channel>" + "".join(
+        f"<item><title>{title}</title><link>https://ex.com/{title}</link><pubDate>{formatdate(NOW - age, usegmt=True)}</pubDate></item>"
+        for title, age in items
+    ) + "</channel></rss>"
+
+# (name, items on the first poll, items on the second poll, title the second poll must pick up)
+ORDERING = [
+    ("newest-first", [("b", 600), ("a", 1200)], [("c", 60), ("b", 600), ("a", 1200)], "c"),
+    ("pinned item", [("pin", 7200), ("b", 600), ("a", 1200)],
+     [("pin", 7200), ("c", 60), ("b", 600), ("a", 1200)], "c"),
+    ("oldest-first", [("old1", 4 * 86400), ("old2", 3 * 86400), ("old3", 2 * 86400), ("a", 1200), ("b", 600)],
+     [("old1", 4 * 86400), ("old2", 3 * 86400), ("old3", 2 * 86400), ("a", 1200), ("b", 600), ("c", 60)], "c"),
+]
+
+def check_ordering():
+    """A second poll, stopping at what the first one saw, must still find the new entry."""
+    failures = 0
+    for name, first, second, expected in ORDERING:
+        feed_url = f"https://ex.com/{name}"
+        known = frozenset(rss_alerts.entry_fingerprint(feed_url, entry) for entry in parse_feed(rss_items(first), feed_url))
+        titles = [entry["title"] for entry in parse_feed(rss_items(second), feed_url, known)]
+        if expected not in titles:
+            failures += 1
+            print(f"MISSED new entry in {name} feed: got {titles}")
+    print(f"Feed order: {len(ORDERING) - failures}/{len(ORDERING)} feeds deliver new entries on the next poll\n")
+    return failures
+
+def reference(feed_content):
+    """The pre-streaming parse: feedparser over the whole body, then the first five recent entries."""
+    parsed = feedparser.parse(feed_content)
+    return [compact_entry(e) for e in [e for e in parsed.entries if is_recent(e)][:5]]
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    mismatches = 0
+    for name, feed_content in CORPUS.items():
+        expected = select_entries(feedparser.parse(feed_content).entries, "", ())
+        actual = parse_feed(feed_content)
+        if actual != expected:
+            mismatches += 1
+            print(f"MISMATCH in {name}\n  expected: {expected!r}\n  actual:   {actual!r}")
+    print(f"Equivalence: {len(CORPUS) - mismatches}/{len(CORPUS)} feeds identical\n")
+    mismatches += check_ordering()
+
+    print(f"{'feed':<18}{'size':>10}{'feedparser':>14}{'streaming':>12}{'speedup':>9}{'peak fp':>10}{'peak st':>10}")
+    for kind in ("rss", "atom", "youtube"):
+        for items in (20, 500, 5000):
+            feed_content = build_feed(0, kind, items, 500, "http://127.0.0.1", NOW)
+            if reference(feed_content) != parse_feed(feed_content):
+                mismatches += 1
+                print(f"MISMATCH in generated {kind} feed with {items} items")
+            start = time.perf_counter()
+            for _ in range(iterations):
+                reference(feed_content)
+            full_time = (time.perf_counter() - start) / iterations
+            start = time.perf_counter()
+            for _ in range(iterations):
+                rss_alerts.clean_html_cache.clear()
+                parse_feed(feed_content)
+            stream_time = (time.perf_counter() - start) / iterations
+            print(f"{kind + ' x' + str(items):<18}{len(feed_content) // 1024:>8}KB"
+                  f"{full_time * 1000:>12.1f}ms{stream_time * 1000:>10.1f}ms{full_time / stream_time:>8.1f}x"
+                  f"{peak_memory(reference, feed_content) / 2**20:>8.1f}MB"
+                  f"{peak_memory(parse_feed, feed_content) / 2**20:>8.1f}MB")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Benchmark: dedup storage per entry, "{feed}::{sha256}" string keys vs. 64-bit fingerprints.
+
+Compares an in-memory set of key strings with a sorted array('Q'), and the old
+`seen` SQLite table with the `fingerprints` table SeenStore uses now, plus
+lookup rates for both tables.
+
+Usage: python benchmarks/bench_seen_store.py [entries]
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rss_alerts import SeenStore, entry_fingerprint, hash_entry
+
+FEEDS = 500
+
+def make_entries(count):
+    for i in range(count):
+        feed_url = f"https://site{i % FEEDS}.example.com/feed.xml"
+        link = f"https://site{i % FEEDS}.example.com/posts/{i}-some-article-slug"
+        entry = {"id": link, "title": f"Article {i}", "link": link, "published": "Mon, 06 Jan 2025 10:00:00 GMT"}
+        yield feed_url, entry
+
+def legacy_key(feed_url, entry):
+    return f"{feed_url}::{hash_entry(entry['title'], entry['link'], entry['published'])}"
+
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+def lookup_rate(contains, keys):
+    start = time.perf_counter()
+    for key in keys:
+        contains(key)
+    return len(keys) / (time.perf_counter() - start)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    entries = list(make_entries(count))
+    keys = [legacy_key(feed_url, entry) for feed_url, entry in entries]
+    fingerprints = [entry_fingerprint(feed_url, entry) for feed_url, entry in entries]
+
+    _, set_size = measure(lambda: {legacy_key(feed_url, entry) for feed_url, entry in entries})
+    _, array_size = measure(lambda: array("Q", sorted(fp & 0xFFFFFFFFFFFFFFFF for fp in fingerprints)))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        legacy_path = os.path.join(workdir, "legacy.db")
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("CREATE TABLE seen (key TEXT PRIMARY KEY, seen_at REAL NOT NULL)")
+        conn.execute("CREATE INDEX seen_at_idx ON seen (seen_at)")
+        conn.executemany("INSERT INTO seen VALUES (?, ?)", ((key, time.time()) for key in keys))
+        conn.commit()
+        conn.execute("VACUUM")
+        legacy_bytes = os.path.getsize(legacy_path)
+        sample = random.sample(keys, min(20000, count))
+        legacy_rate = lookup_rate(lambda key: conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone(), sample)
+        conn.close()
+
+        store_path = os.path.join(workdir, "fingerprints.db")
+        store = SeenStore(store_path)
+        store.conn.executemany("INSERT INTO fingerprints VALUES (?, ?)", ((fp, time.time()) for fp in fingerprints))
+        store.commit()
+        store.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        store.conn.execute("VACUUM")
+        store_bytes = os.path.getsize(store_path)
+        sample = random.sample(fingerprints, min(20000, count))
+        store_rate = lookup_rate(store.__contains__, sample)
+        store.close()
+
+    print(f"{count} entries across {FEEDS} feeds, bytes per entry:")
+    print(f"  in memory   set of key strings {set_size / count:8.1f}   array('Q') {array_size / count:6.1f}"
+          f"   {set_size / array_size:5.1f}x smaller")
+    print(f"  SQLite      seen (TEXT keys)   {legacy_bytes / count:8.1f}   fingerprints {store_bytes / count:4.1f}"
+          f"   {legacy_bytes / store_bytes:5.1f}x smaller")
+    print(f"  lookups/s   seen {legacy_rate:10.0f}   fingerprints {store_rate:10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Offline WebSub benchmark: push delivery through a local stand-in hub vs. polling.
+
+Serves feeds that advertise a hub, a minimal hub (subscribe -> 202, then a
+verification GET with a challenge) and a mock Discord webhook. Once every feed
+is subscribed, the hub publishes new entries signed with HMAC-SHA256 plus one
+badly signed push that must be ignored. Reports publish-to-alert latency and
+how many polls the feeds received while pushes were flowing.
+
+Usage: python benchmarks/bench_websub.py [--feeds 20] [--publishes 50]
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import secrets
+import sys
+import tempfile
+import time
+from email.utils import formatdate
+
+import aiohttp
+from aiohttp import web
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+POLL_INTERVAL = 5  # Fixed poll interval of the bench feeds, the rate they would be polled without WebSub
+
+def render_feed(base_url, feed_id, items, first=0):
+    entries = "".join(
+        f"<item><title>{title}</title><link>{base_url}/article/{feed_id}/{i}</link>"
+        f"<guid>{base_url}/article/{feed_id}/{i}</guid><pubDate>{formatdate(published)}</pubDate></item>"
+        for i, (title, published) in reversed(list(enumerate(items, first)))
+    )
+    return (f'<?xml version="1.0"?><rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+            f'<title>Feed {feed_id}</title><atom:link rel="hub" href="{base_url}/hub"/>'
+            f'<atom:link rel="self" href="{base_url}/feed/{feed_id}"/>{entries}</channel></rss>')
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+async def run(args):
+    import rss_alerts
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    rss_alerts.DISCORD_WEBHOOK_URL = None
+    rss_alerts.WEBSUB_SYNC_INTERVAL = 1
+    feeds = {i: [] for i in range(args.feeds)}
+    subscriptions = {}  # topic -> (callback, secret)
+    polls = {"count": 0}
+    published_at = {}  # title -> publish time
+    delivered = {}  # title -> delivery time
+
+    async def feed(request):
+        polls["count"] += 1
+        feed_id = int(request.match_info["feed_id"])
+        return web.Response(text=render_feed(base_url, feed_id, feeds[feed_id]), content_type="application/rss+xml")
+
+    async def verify(mode, topic, callback, secret):
+        challenge = secrets.token_hex(8)
+        query = {"hub.mode": mode, "hub.topic": topic, "hub.challenge": challenge, "hub.lease_seconds": "864000"}
+        async with client.get(callback, params=query) as resp:
+            if resp.status == 200 and await resp.text() == challenge:
+                if mode == "subscribe":
+                    subscriptions[topic] = (callback, secret)
+                else:
+                    subscriptions.pop(topic, None)
+
+    async def hub(request):
+        form = await request.post()
+        asyncio.create_task(verify(form["hub.mode"], form["hub.topic"], form["hub.callback"], form.get("hub.secret")))
+        return web.Response(status=202)
+
+    async def webhook(request):
+        payload = await request.json()
+        now = time.monotonic()
+        for embed in payload.get("embeds", []):
+            delivered.setdefault(embed["title"], now)
+        return web.Response(status=204)
+
+    async def push(feed_id, title, sign=True):
+        # Pushes carry only the new entry; a forged one never shows up in the polled feed
+        items = feeds[feed_id] if sign else list(feeds[feed_id])
+        items.append((title, time.time()))
+        body = render_feed(base_url, feed_id, items[-1:], len(items) - 1).encode()
+        callback, secret = subscriptions[f"{base_url}/feed/{feed_id}"]
+        digest = hmac.new((secret if sign else "wrong secret").encode(), body, hashlib.sha256).hexdigest()
+        published_at[title] = time.monotonic()
+        async with client.post(callback, data=body, headers={"Content-Type": "application/rss+xml",
+                                                             "X-Hub-Signature": f"sha256={digest}"}) as resp:
+            await resp.read()
+
+    app = web.Application()
+    app.router.add_get("/feed/{feed_id}", feed)
+    app.router.add_post("/hub", hub)
+    app.router.add_post("/webhook", webhook)
+    app.router.add_get("/article/{feed_id}/{item}", lambda request: web.Response(text="<html></html>", content_type="text/html"))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+
+    config = {f"{base_url}/feed/{i}": {"webhook": f"{base_url}/webhook", "category": "Bench",
+                                       "poll_interval": POLL_INTERVAL} for i in feeds}
+    with open(rss_alerts.CONFIG_FILE, "w") as f:
+        json.dump(config, f)
+
+    client = aiohttp.ClientSession()
+    tasks = [asyncio.create_task(coro) for coro in
+             (rss_alerts.rss_checker(), rss_alerts.sender_worker(), rss_alerts.websub_worker())]
+    try:
+        deadline = time.monotonic() + args.timeout
+        while len(subscriptions) < len(feeds) and time.monotonic() < deadline:
+            await asyncio.sleep(0.2)
+        if len(subscriptions) < len(feeds):
+            sys.exit(f"Only {len(subscriptions)}/{len(feeds)} feeds were subscribed")
+        # Let every feed finish the poll that was already scheduled before its subscription went live
+        await asyncio.sleep(POLL_INTERVAL * 1.2)
+
+        window_start, polls_before = time.monotonic(), polls["count"]
+        await push(0, "Forged entry", sign=False)
+        for n in range(args.publishes):
+            await push(random.randrange(len(feeds)), f"Pushed entry {n}")
+            await asyncio.sleep(args.spacing)
+        while len(delivered) < args.publishes and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        window = time.monotonic() - window_start
+        window_polls = polls["count"] - polls_before
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for lane_queue, lane_task in list(rss_alerts.webhook_lanes.values()):
+            lane_task.cancel()
+        await client.close()
+        await rss_alerts.close_session()
+        await runner.cleanup()
+
+    latencies = [delivered[title] - published_at[title] for title in delivered if title in published_at]
+    print(f"{len(feeds)} feeds subscribed through the stand-in hub")
+    print(f"delivered {len([t for t in delivered if t.startswith('Pushed')])}/{args.publishes} pushed entries, "
+          f"forged push delivered: {'Forged entry' in delivered}")
+    if latencies:
+        print(f"publish-to-alert latency: p50 {percentile(latencies, 50):.2f}s, p99 {percentile(latencies, 99):.2f}s "
+              f"(COALESCE_WINDOW {rss_alerts.COALESCE_WINDOW}s)")
+    print(f"polls during the {window:.1f}s push window: {window_polls} "
+          f"(polling every {POLL_INTERVAL}s alone: ~{int(len(feeds) * window / POLL_INTERVAL)})")
+    return 0 if len(latencies) == args.publishes and "Forged entry" not in delivered else 1
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--publishes", type=int, default=50)
+    parser.add_argument("--spacing", type=float, default=0.2, help="seconds between published entries")
+    parser.add_argument("--coalesce-window", type=float, default=0.2)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--port", type=int, default=8797)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    # rss_alerts and websub read their tunables at import time
+    os.environ["COALESCE_WINDOW"] = str(args.coalesce_window)
+    os.environ["WEBSUB_CALLBACK_URL"] = f"http://127.0.0.1:{args.port + 1}"
+    os.environ["WEBSUB_HOST"] = "127.0.0.1"
+    os.environ["WEBSUB_PORT"] = str(args.port + 1)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        return asyncio.run(run(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Offline check of HelixProvider against a local stand-in for Twitch and decapi.
+
+Serves the OAuth token endpoint, Helix /streams and /users and the decapi
+endpoints the fallback uses. Checks that 151 channels go out as 100 + 51
+logins, that the app token is reused and refreshed once after a 401, and
+that a failing Helix request falls back to decapi.
+
+Usage: python benchmarks/check_twitch_helix.py [--port 8796]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from twitch_providers import DecapiProvider, HelixProvider
+
+CHANNELS = [f"Streamer{i}" for i in range(151)]
+LIVE = {"streamer0", "streamer99", "streamer150"}
+
+async def run(args):
+    base_url = f"http://127.0.0.1:{args.port}"
+    state = {"tokens": 0, "valid": None, "fail": False, "batches": [], "decapi": 0}
+
+    async def token(request):
+        state["tokens"] += 1
+        state["valid"] = f"token-{state['tokens']}"
+        return web.json_response({"access_token": state["valid"], "expires_in": 3600, "token_type": "bearer"})
+
+    def authorized(request):
+        return (request.headers.get("Client-ID") == "client"
+                and request.headers.get("Authorization") == f"Bearer {state['valid']}")
+
+    async def streams(request):
+        if not authorized(request):
+            return web.json_response({"status": 401, "message": "Invalid OAuth token"}, status=401)
+        if state["fail"]:
+            return web.json_response({"status": 503}, status=503)
+        logins = request.query.getall("user_login", [])
+        state["batches"].append((len(logins), request.query.get("first")))
+        data = [{"user_login": login.lower(), "title": f"{login} live", "game_name": "Chess",
+                 "viewer_count": 42, "started_at": "2026-01-01T00:00:00Z"}
+                for login in logins if login.lower() in LIVE]
+        return web.json_response({"data": data, "pagination": {}})
+
+    async def users(request):
+        if not authorized(request):
+            return web.json_response({"status": 401}, status=401)
+        if state["fail"]:
+            return web.json_response({"status": 503}, status=503)
+        login = request.query["login"]
+        return web.json_response({"data": [{"login": login, "profile_image_url": f"{base_url}/helix-avatar/{login}"}]})
+
+    async def decapi(request):
+        state["decapi"] += 1
+        endpoint, channel = request.match_info["endpoint"], request.match_info["channel"].lower()
+        if endpoint == "uptime":
+            return web.Response(text="1 hour, 5 minutes" if channel in LIVE else f"{channel} is offline")
+        if endpoint == "avatar":
+            return web.Response(text=f"{base_url}/decapi-avatar/{channel}")
+        return web.Response(text=f"decapi {endpoint}")
+
+    app = web.Application()
+    app.router.add_post("/oauth2/token", token)
+    app.router.add_get("/helix/streams", streams)
+    app.router.add_get("/helix/users", users)
+    app.router.add_get("/decapi/{endpoint}/{channel}", decapi)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+
+    checks = []
+
+    def check(name, ok, detail=""):
+        checks.append(ok)
+        print(f"{'ok      ' if ok else 'MISMATCH'} {name}{'' if ok else f': {detail}'}")
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            fallback = DecapiProvider(session, base_url=f"{base_url}/decapi")
+            provider = HelixProvider(session, "client", "secret", fallback=fallback,
+                                     base_url=f"{base_url}/helix", auth_url=f"{base_url}/oauth2/token")
+
+            result = await provider.get_streams(CHANNELS)
+            check("151 logins sent as 100 + 51", state["batches"] == [(100, "100"), (51, "100")], state["batches"])
+            live = {channel for channel, stream in result.items() if stream}
+            check("live and offline channels", len(result) == 151 and live == LIVE, sorted(live))
+            stream = result["streamer0"]
+            check("stream fields", stream["title"] == "Streamer0 live" and stream["game"] == "Chess"
+                  and stream["viewers"] == "42" and stream["started_at"] == 1767225600.0, stream)
+
+            await provider.get_streams(CHANNELS[:10])
+            check("token reused between requests", state["tokens"] == 1, f"{state['tokens']} tokens")
+
+            state["valid"] = "revoked"
+            result = await provider.get_streams(CHANNELS[:10])
+            check("401 refreshes the token once", state["tokens"] == 2 and result["streamer0"] is not None,
+                  f"{state['tokens']} tokens")
+            avatar = await provider.get_avatar("Streamer1")
+            check("users endpoint avatar", avatar == f"{base_url}/helix-avatar/Streamer1", avatar)
+            check("no decapi calls while Helix works", state["decapi"] == 0, f"{state['decapi']} calls")
+
+            state["fail"] = True
+            result = await provider.get_streams(CHANNELS[:100])
+            live = {channel for channel, stream in result.items() if stream}
+            check("streams fall back to decapi", live == {"streamer0", "streamer99"} and len(result) == 100
+                  and state["decapi"] == 100, f"{sorted(live)}, {state['decapi']} decapi calls")
+            details = await provider.get_stream_details("streamer0", result["streamer0"])
+            check("decapi stream details", details["title"] == "decapi status" and details["game"] == "decapi game"
+                  and details["viewers"] == "decapi viewercount", details)
+            avatar = await provider.get_avatar("Streamer1")
+            check("avatar falls back to decapi", avatar == f"{base_url}/decapi-avatar/streamer1", avatar)
+    finally:
+        await runner.cleanup()
+
+    print(f"\nChecks: {sum(checks)}/{len(checks)} passed")
+    return 0 if all(checks) else 1
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8796)
+    return asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    sys.exit(main())
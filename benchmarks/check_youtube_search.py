@@ -0,0 +1,67 @@
+"""Offline check of the YouTube search page helpers against saved HTML fixtures.
+
+The fixtures in benchmarks/fixtures/ cover both ways a search page embeds its
+data (`var ytInitialData = {...}` and `window["ytInitialData"] = {...}`), with
+braces and "};" inside JSON strings, a non-channel result and a channel with
+no handle. Also checks normalize_youtube_query and times the extractor.
+
+Usage: python benchmarks/check_youtube_search.py [iterations]
+"""
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from youtube_search import extract_yt_initial_data, normalize_youtube_query, parse_channel_results
+
+PAGES = ["youtube_search_var.html", "youtube_search_window.html"]
+
+QUERIES = {
+    "@Kurzgesagt": "kurzgesagt",
+    "  kurzgesagt  ": "kurzgesagt",
+    "https://www.youtube.com/@Kurzgesagt": "kurzgesagt",
+    "https://m.youtube.com/@kurz.gesagt-1/videos": "kurz.gesagt-1",
+    "Three  Blue\tOne Brown": "three blue one brown",
+}
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with open(os.path.join(FIXTURES_DIR, "youtube_search_expected.json"), encoding="utf-8") as f:
+        expected = [tuple(channel) for channel in json.load(f)]
+
+    failures = 0
+    for name in PAGES:
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            html = f.read()
+        channels = parse_channel_results(extract_yt_initial_data(html))
+        if channels != expected:
+            failures += 1
+            print(f"MISMATCH in {name}\n  expected: {expected!r}\n  actual:   {channels!r}")
+        start = time.perf_counter()
+        for _ in range(iterations):
+            extract_yt_initial_data(html)
+        elapsed = (time.perf_counter() - start) / iterations
+        print(f"{name:<30}{len(html) // 1024:>6}KB  {len(channels)} channels  extract {elapsed * 1e6:8.1f} us")
+
+    try:
+        extract_yt_initial_data("<html><body>no data here</body></html>")
+        failures += 1
+        print("MISMATCH: a page without ytInitialData did not raise ValueError")
+    except ValueError:
+        pass
+
+    for query, key in QUERIES.items():
+        if normalize_youtube_query(query) != key:
+            failures += 1
+            print(f"MISMATCH normalize_youtube_query({query!r}) = {normalize_youtube_query(query)!r}, expected {key!r}")
+
+    checks = len(PAGES) + 1 + len(QUERIES)
+    print(f"\nChecks: {checks - failures}/{checks} passed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import bisect
+import logging
+import math
+
+from aiohttp import web
+
+# Latency buckets in seconds and size buckets in bytes
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+class Registry:
+    """Holds the metrics and renders them in the Prometheus text format.
+
+    Nothing is recorded until enable() is called, so instrumented code pays
+    only an attribute check while metrics are off.
+    """
+
+    def __init__(self):
+        self.metrics = []
+        self.enabled = False
+
+    def enable(self):
+        self.enabled = True
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels) + "}"
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.values = {}
+        registry.register(self)
+
+    def inc(self, amount=1, **labels):
+        if not registry.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        return [f"{self.name}{format_labels(key)} {format_value(value)}" for key, value in self.values.items()]
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name, help_text, function=None):
+        self.name = name
+        self.help_text = help_text
+        self.values = {}
+        # A gauge with a function is read at scrape time instead of being set on the hot path
+        self.function = function
+        registry.register(self)
+
+    def set(self, value, **labels):
+        if not registry.enabled:
+            return
+        self.values[tuple(sorted(labels.items()))] = value
+
+    def samples(self):
+        if self.function:
+            return [f"{self.name} {format_value(self.function())}"]
+        return [f"{self.name}{format_labels(key)} {format_value(value)}" for key, value in self.values.items()]
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.values = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+        registry.register(self)
+
+    def observe(self, value, **labels):
+        if not registry.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        counts = self.values.get(key)
+        if counts is None:
+            counts = self.values[key] = [0] * (len(self.buckets) + 2)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def samples(self):
+        lines = []
+        for key, counts in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{format_labels(key + (('le', format_value(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(key)} {format_value(counts[-1])}")
+            lines.append(f"{self.name}_count{format_labels(key)} {cumulative}")
+        return lines
+
+async def start_metrics_server(host, port):
+    """Serve /metrics and start recording; returns the aiohttp runner."""
+    async def handle_metrics(request):
+        return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    registry.enable()
+    logging.info(f"[Metrics] Serving Prometheus metrics on http://{host}:{port}/metrics")
+    return runner
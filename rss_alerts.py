@@ -3,28 +3,134 @@ import feedparser
 import hashlib
 import aiohttp
 import asyncio
+import codecs
+import heapq
 import logging
+import random
 import re
+import sqlite3
+import threading
 import time
 import os
+import posixpath
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
-from urllib.parse import urlparse, parse_qs, urlunparse, urljoin
+from email.utils import parsedate_to_datetime
+from types import MappingProxyType
+from html.parser import HTMLParser
+from urllib.parse import urlparse, parse_qs, parse_qsl, urlencode, urlunparse, urljoin
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
+from metrics import Counter, Gauge, Histogram, SIZE_BUCKETS, start_metrics_server
+from sharding import WORKER_COUNT, WORKER_INDEX, owns
+from twitch_providers import create_provider
+from websub import WEBSUB_CALLBACK_URL, WEBSUB_HOST, WEBSUB_PORT, WebSubManager
 
 load_dotenv()
 
 CONFIG_FILE = 'feeds_config.json'
-SEEN_FILE = 'seen_entries.txt'
+SEEN_FILE = 'seen_entries.txt'  # Legacy flat file, imported into SEEN_DB_FILE on first start
+SEEN_DB_FILE = 'seen_entries.db'
+# Sharded workers share the seen database but keep their own caches
+FEED_CACHE_FILE = f'feed_cache.{WORKER_INDEX}.json' if WORKER_COUNT > 1 else 'feed_cache.json'
+OG_IMAGE_CACHE_FILE = f'og_image_cache.{WORKER_INDEX}.json' if WORKER_COUNT > 1 else 'og_image_cache.json'
+SQLITE_BUSY_TIMEOUT = 30  # Seconds a worker waits for another worker's write to the seen database
+SQLITE_LOCK_WAIT = 0.05  # Seconds a locked write may block the event loop before it is retried asynchronously
 RSS_CHECK_INTERVAL = 300   # 5 minutes for RSS
 TWITCH_CHECK_INTERVAL = 120  # 2 minutes for Twitch
-SEND_INTERVAL = 5
+TWITCH_MAX_CONCURRENT_CHECKS = int(os.getenv("TWITCH_MAX_CONCURRENT_CHECKS", 10))
+TWITCH_AVATAR_TTL = 86400
+GLOBAL_SEND_RATE = int(os.getenv("GLOBAL_SEND_RATE", 40))  # Discord allows 50 requests/s globally
+MAX_SEND_RETRIES = 3
+LANE_IDLE_TIMEOUT = 300  # Close a webhook's delivery lane after this long without items
+COALESCE_WINDOW = float(os.getenv("COALESCE_WINDOW", 2))  # Seconds a lane waits to batch more items
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_TITLE_CHARS = 256
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+MAX_CONTENT_CHARS = 2000
+MAX_CONCURRENT_FETCHES = int(os.getenv("MAX_CONCURRENT_FETCHES", 20))
+MAX_FETCHES_PER_HOST = int(os.getenv("MAX_FETCHES_PER_HOST", 2))
+SLOWEST_HOSTS_REPORTED = 5
+FEED_MIN_INTERVAL = int(os.getenv("FEED_MIN_INTERVAL", 60))
+FEED_MAX_INTERVAL = int(os.getenv("FEED_MAX_INTERVAL", 21600))  # 6 hours for quiet feeds
+FEED_MAX_BACKOFF = int(os.getenv("FEED_MAX_BACKOFF", 3600))
+SCHEDULER_TICK = 10  # Longest the scheduler sleeps before picking up config changes
+SEEN_RETENTION = int(os.getenv("SEEN_RETENTION", 604800))  # 7 days, well past the 24h recency window
+OG_IMAGE_CACHE_SIZE = 5000
+OG_IMAGE_CACHE_TTL = 604800  # 7 days for resolved images
+OG_IMAGE_NEGATIVE_TTL = 21600  # 6 hours for pages without an image
+OG_IMAGE_STREAMING = os.getenv("OG_IMAGE_STREAMING", "1") != "0"
+OG_IMAGE_MAX_BYTES = 512 * 1024
+OG_IMAGE_CHUNK_SIZE = 64 * 1024  # Most of a page read at once and scanned in one parse executor call
+CACHE_SAVE_INTERVAL = 60  # Feed and og:image caches are written at most this often, and only when changed
+FEED_STREAMING = os.getenv("FEED_STREAMING", "1") != "0"
+MAX_FEED_BYTES = int(os.getenv("MAX_FEED_BYTES", 2 * 1024 * 1024))  # Longer bodies are cut off; entries are at the top
+FEED_CHUNK_SIZE = 64 * 1024
+MAX_ENTRIES_PER_FEED = 5  # Limit to 5 to avoid spamming on startup
+STALE_ENTRIES_BEFORE_STOP = 3  # Old entries in a row before the parser assumes the rest of the feed is older
+PARSE_EXECUTOR = os.getenv("PARSE_EXECUTOR", "thread")  # "thread" or "process"
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+CLEAN_HTML_CACHE_SIZE = 4096
+CLEAN_HTML_CHUNK_SIZE = 1024
+LOOP_LAG_INTERVAL = 1.0
+LOOP_LAG_WARNING = 0.25  # Log a warning when the event loop stalls longer than this
+DELIVERY_WINDOW = int(os.getenv("DELIVERY_WINDOW", 500))  # Pending deliveries loaded into memory at once
+DELIVERY_MAX_ATTEMPTS = int(os.getenv("DELIVERY_MAX_ATTEMPTS", 8))
+DELIVERY_RETRY_DELAY = 30  # First retry delay for a failed delivery, doubled per attempt
+DELIVERY_MAX_BACKOFF = 3600
+DELIVERY_POLL_INTERVAL = 5  # How often the sender looks for deliveries whose retry is due
+DELIVERY_WEBHOOK_WINDOW = 50  # Pending deliveries of one webhook in memory at once, so a backlog can't starve the others
+RECENT_LINK_TTL = int(os.getenv("RECENT_LINK_TTL", 172800))  # Window in which a webhook gets each article once; 0 disables
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "ref"})  # Ignored when comparing links, on top of utm_*
+DEFAULT_PORTS = {"http": 80, "https": 443}
+WEBSUB_POLL_INTERVAL = int(os.getenv("WEBSUB_POLL_INTERVAL", 3600))  # Safety-net polling for feeds with a live push subscription
+WEBSUB_SYNC_INTERVAL = 60  # How often subscriptions are reconciled with the config
 twitch_last_live = {}
+twitch_avatar_cache = {}  # channel -> (avatar URL, fetched_at)
+twitch_provider = None
 
 logging.basicConfig(level=logging.INFO)
 sent_articles = set()
-queue = asyncio.Queue()
+delivery_queue = None
 session = None
+fetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+host_semaphores = {}
+feed_cache = {}
+cache_stats = {"not_modified": 0, "hash_hits": 0}
+cache_dirty = {"feed": False, "og_image": False, "saved_at": 0.0}
+link_stats = {"suppressed": 0}
+og_image_cache = OrderedDict()  # Article URL -> [image URL or None, stored_at], in LRU order
+feed_schedule = []  # Heap of (due_time, feed_url)
+feed_state = {}
+webhook_lanes = {}
+webhook_buckets = {}
+global_send_state = {"next_slot": 0.0, "paused_until": 0.0}
+shared_send_conn = None
+websub_manager = None
+parse_executor = None
+loop_lag_stats = {"max": 0.0}
+config_snapshot = {"version": None, "feeds": MappingProxyType({})}
+clean_html_cache = OrderedDict()  # (content hash, max_chars) -> cleaned text, in LRU order
+clean_html_lock = threading.Lock()  # Parse workers may share the cache
+
+# Optional: Prometheus metrics endpoint, disabled unless METRICS_PORT is set
+METRICS_PORT = os.getenv("METRICS_PORT")
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+FEED_FETCH_SECONDS = Histogram("rss_feed_fetch_seconds", "Feed fetch latency per feed")
+FEED_RESPONSE_BYTES = Histogram("rss_feed_response_bytes", "Size of feed responses with a body", SIZE_BUCKETS)
+FEED_PARSE_SECONDS = Histogram("rss_feed_parse_seconds", "Feed parse time, including parse executor wait")
+NEW_ENTRIES_TOTAL = Counter("rss_new_entries_total", "New entries queued for delivery")
+DUPLICATE_LINKS_TOTAL = Counter("rss_duplicate_links_suppressed_total",
+                                "Entries dropped because their canonical link was recently queued for the same webhook")
+CYCLE_NEW_ENTRIES = Gauge("rss_cycle_new_entries", "New entries queued in the last check cycle")
+QUEUE_DEPTH = Gauge("rss_queue_depth", "Entries waiting for delivery in the durable queue",
+                    lambda: len(delivery_queue) if delivery_queue else 0)
+SEND_SECONDS = Histogram("rss_webhook_send_seconds", "Webhook POST latency")
+WEBHOOK_RESPONSES = Counter("rss_webhook_responses_total", "Webhook responses by webhook id and status class")
+TWITCH_CHECK_SECONDS = Histogram("twitch_check_seconds", "Duration of a full Twitch live-status check")
+EVENT_LOOP_LAG = Gauge("event_loop_lag_seconds", "Most recent event loop lag measurement")
 
 # Optional: System notifications webhook
 DISCORD_WEBHOOK_URL = os.getenv("SYSTEM_WEBHOOK_URL")
@@ -50,7 +156,8 @@ def is_valid_image_url(url):
     # Relaxed check: just ensure it's a http URL. Discord handles the rest.
     return url and url.startswith("http")
 
-def clean_html(raw_html):
+def clean_html_soup(raw_html):
+    """Reference BeautifulSoup implementation of clean_html, kept for benchmarks."""
     if not raw_html:
         return ""
     try:
@@ -59,21 +166,489 @@ def clean_html(raw_html):
     except Exception:
         return raw_html
 
+class TextExtractor(HTMLParser):
+    """Collects visible text nodes the way BeautifulSoup.get_text does (no script/style/comments)."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.length = 0
+        self.skip_depth = 0
+        self.in_text = False  # The last event was text, so more data continues the same node
+
+    def handle_starttag(self, tag, attrs):
+        self.in_text = False
+        if tag in ("script", "style"):
+            self.skip_depth += 1
+
+    def handle_endtag(self, tag):
+        self.in_text = False
+        if tag in ("script", "style") and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_comment(self, data):
+        self.in_text = False
+
+    def handle_decl(self, decl):
+        self.in_text = False
+
+    def handle_pi(self, data):
+        self.in_text = False
+
+    def unknown_decl(self, data):
+        self.in_text = False
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        # A text node cut by a feed() chunk boundary arrives in pieces; glue them back together
+        if self.in_text:
+            self.parts[-1] += data
+            self.length += len(data)
+        else:
+            self.parts.append(data)
+            self.length += len(data) + 1
+            self.in_text = True
+
+    def text(self):
+        return " ".join(self.parts).strip()
+
+def clean_html(raw_html, max_chars=None):
+    """Visible text of an HTML fragment, text nodes joined by spaces.
+
+    With max_chars, parsing stops once the text is known to be longer than
+    max_chars and the result is cut to max_chars - 3 characters plus "...".
+    Results are memoized by content hash.
+    """
+    if not raw_html:
+        return ""
+    key = (hashlib.blake2b(raw_html.encode(), digest_size=16).digest(), max_chars)
+    with clean_html_lock:
+        if key in clean_html_cache:
+            clean_html_cache.move_to_end(key)
+            return clean_html_cache[key]
+    try:
+        extractor = TextExtractor()
+        for start in range(0, len(raw_html), CLEAN_HTML_CHUNK_SIZE):
+            extractor.feed(raw_html[start:start + CLEAN_HTML_CHUNK_SIZE])
+            # Cheap length check first; the exact one strips surrounding whitespace
+            if max_chars and extractor.length > max_chars and len(extractor.text()) > max_chars:
+                break
+        else:
+            extractor.close()
+        text = extractor.text()
+    except Exception:
+        text = raw_html
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars - 3] + "..."
+    with clean_html_lock:
+        clean_html_cache[key] = text
+        while len(clean_html_cache) > CLEAN_HTML_CACHE_SIZE:
+            clean_html_cache.popitem(last=False)
+    return text
+
+def freeze_config(config):
+    return MappingProxyType({url: MappingProxyType(dict(entry)) for url, entry in config.items()})
+
 def load_config():
-    with open(CONFIG_FILE) as f:
-        return json.load(f)
+    """Return the current read-only config snapshot.
 
-def load_seen_entries():
+    feeds_config.json is only re-read when its inode, mtime or size changes, so
+    callers can use this every loop. A file that fails to parse keeps the
+    previous snapshot.
+    """
     try:
-        with open(SEEN_FILE, "r") as f:
-            return set(line.strip() for line in f)
+        st = os.stat(CONFIG_FILE)
+        version = (st.st_ino, st.st_mtime_ns, st.st_size)
     except FileNotFoundError:
-        return set()
+        version = None
+    if version == config_snapshot["version"]:
+        return config_snapshot["feeds"]
+    if version is None:
+        feeds = freeze_config({})
+    else:
+        try:
+            with open(CONFIG_FILE) as f:
+                # Each worker only sees the feeds and twitch channels it owns
+                feeds = freeze_config({key: entry for key, entry in json.load(f).items() if owns(key)})
+        except (OSError, json.JSONDecodeError) as e:
+            logging.error(f"Failed to reload {CONFIG_FILE}, keeping previous config: {type(e).__name__} - {e}")
+            config_snapshot["version"] = version
+            return config_snapshot["feeds"]
+    added, removed, changed = diff_config(config_snapshot["feeds"], feeds)
+    if config_snapshot["version"] is not None:
+        logging.info(f"[Config] Reloaded: {len(added)} added, {len(removed)} removed, {len(changed)} changed")
+    config_snapshot["version"] = version
+    config_snapshot["feeds"] = feeds
+    return feeds
+
+def feed_subscriptions(config):
+    """(webhook, category) pairs a feed's new entries fan out to.
+
+    Feeds added before fan-out have a single top-level webhook and category
+    instead of a "subscriptions" list.
+    """
+    if "subscriptions" in config:
+        return [(sub["webhook"], sub.get("category", "RSS")) for sub in config["subscriptions"]]
+    return [(config["webhook"], config.get("category", "RSS"))]
+
+def diff_config(old, new):
+    added = new.keys() - old.keys()
+    removed = old.keys() - new.keys()
+    changed = {url for url in new.keys() & old.keys() if new[url] != old[url]}
+    return added, removed, changed
+
+class SeenStore:
+    """Dedup state in SQLite (WAL): one 64-bit fingerprint per row, expired after SEEN_RETENTION.
+
+    Each subscriber of a feed has its own fingerprint for an entry (see
+    subscriber_fingerprint). Plain entry fingerprints, written before feeds had
+    several subscribers, count as seen by every subscriber until they expire. Keys
+    from before fingerprints ("{feed}::{sha256}" strings in the `seen` table,
+    imported from seen_entries.txt or written by older versions) are still honoured
+    until they expire, then the old table is dropped.
+    """
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # An INTEGER PRIMARY KEY is the rowid itself, so a row is just the fingerprint and its timestamp
+        self.conn.execute("CREATE TABLE IF NOT EXISTS fingerprints (fingerprint INTEGER PRIMARY KEY, seen_at REAL NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS fingerprints_seen_at_idx ON fingerprints (seen_at)")
+        # Canonical links recently queued per webhook (see link_key), expired after RECENT_LINK_TTL
+        self.conn.execute("CREATE TABLE IF NOT EXISTS recent_links (key INTEGER PRIMARY KEY, queued_at REAL NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS recent_links_queued_at_idx ON recent_links (queued_at)")
+        self.conn.commit()
+        self.has_legacy = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'seen'"
+        ).fetchone() is not None
+
+    def __contains__(self, fingerprint):
+        return self.conn.execute("SELECT 1 FROM fingerprints WHERE fingerprint = ?", (fingerprint,)).fetchone() is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def add(self, fingerprint):
+        self.conn.execute(
+            "INSERT INTO fingerprints (fingerprint, seen_at) VALUES (?, ?) "
+            "ON CONFLICT(fingerprint) DO UPDATE SET seen_at = excluded.seen_at",
+            (fingerprint, time.time())
+        )
+
+    def add_all(self, fingerprints):
+        with self.conn:
+            for fingerprint in fingerprints:
+                self.add(fingerprint)
+
+    def link_queued(self, key, ttl):
+        return self.conn.execute(
+            "SELECT 1 FROM recent_links WHERE key = ? AND queued_at >= ?", (key, time.time() - ttl)
+        ).fetchone() is not None
+
+    def claim_link(self, key, ttl):
+        """Record a link as queued for a webhook; False if it already was within the last ttl seconds."""
+        now = time.time()
+        cur = self.conn.execute(
+            "INSERT INTO recent_links (key, queued_at) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET queued_at = excluded.queued_at WHERE queued_at < ?",
+            (key, now, now - ttl)
+        )
+        return cur.rowcount == 1
+
+    def seen_legacy(self, key):
+        if not self.has_legacy:
+            return False
+        try:
+            return self.conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+        except sqlite3.OperationalError:
+            self.has_legacy = False  # Another worker dropped the table
+            return False
+
+    def create_legacy_table(self):
+        self.conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, seen_at REAL NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS seen_at_idx ON seen (seen_at)")
+        self.has_legacy = True
+
+    def commit(self):
+        self.conn.commit()
+
+    def expire(self, retention):
+        cutoff = time.time() - retention
+        with self.conn:
+            removed = self.conn.execute("DELETE FROM fingerprints WHERE seen_at < ?", (cutoff,)).rowcount
+            self.conn.execute("DELETE FROM recent_links WHERE queued_at < ?", (time.time() - RECENT_LINK_TTL,))
+            if self.has_legacy:
+                try:
+                    removed += self.conn.execute("DELETE FROM seen WHERE seen_at < ?", (cutoff,)).rowcount
+                    if self.conn.execute("SELECT 1 FROM seen LIMIT 1").fetchone() is None:
+                        self.conn.execute("DROP TABLE seen")
+                        self.has_legacy = False
+                        logging.info("All pre-fingerprint seen keys have expired, dropped the old table")
+                except sqlite3.OperationalError as e:
+                    if "locked" in str(e):
+                        raise
+                    self.has_legacy = False
+        return removed
+
+    def import_legacy_file(self, path):
+        try:
+            with open(path, "r") as f:
+                now = time.time()
+                self.create_legacy_table()
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO seen (key, seen_at) VALUES (?, ?)",
+                    ((line.strip(), now) for line in f if line.strip())
+                )
+        except FileNotFoundError:
+            return
+        self.conn.commit()
+        try:
+            os.replace(path, path + ".migrated")
+        except FileNotFoundError:
+            return  # Another worker imported it at the same time
+        logging.info(f"Imported {path} into {SEEN_DB_FILE}")
+
+    def close(self):
+        self.conn.close()
+
+class DeliveryQueue:
+    """Pending webhook deliveries, stored next to the seen fingerprints in the SeenStore database.
+
+    An entry's fingerprint only moves into `fingerprints` in the transaction that
+    acknowledges its delivery, so a restart resumes the backlog instead of dropping
+    it. At most DELIVERY_WINDOW rows are claimed into memory at a time. Sharded
+    workers share the table, and each one only claims rows for the webhooks it owns,
+    so every webhook's rate limit is tracked by a single process. Every write is its
+    own transaction, run through run_locked, so no lock is held across an await.
+    """
+
+    def __init__(self, seen):
+        self.seen = seen
+        self.conn = seen.conn
+        self.conn.create_function("owns", 1, owns, deterministic=True)
+        self.shard_filter = " AND owns(webhook)" if WORKER_COUNT > 1 else ""
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS deliveries (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "fingerprint INTEGER UNIQUE NOT NULL, webhook TEXT NOT NULL, item TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, next_attempt REAL NOT NULL DEFAULT 0, "
+            "claimed INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS deliveries_claim_idx ON deliveries (claimed, next_attempt)")
+        # Due rows of one webhook in order without a sort; the index ends in the rowid, so ties go oldest first
+        self.conn.execute("DROP INDEX IF EXISTS deliveries_webhook_idx")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS deliveries_due_idx ON deliveries (webhook, claimed, next_attempt)")
+        self.migrate_keyed_rows()
+        # Rows claimed by a previous run were never acknowledged
+        self.conn.execute("UPDATE deliveries SET claimed = 0 WHERE claimed = 1" + self.shard_filter)
+        self.conn.commit()
+        # Startup may wait out other workers; later writes go through run_locked instead of blocking the loop
+        self.conn.execute(f"PRAGMA busy_timeout = {int(SQLITE_LOCK_WAIT * 1000)}")
+        self.claimed = {}  # row id -> webhook, for rows claimed into memory
+        self.held = {}  # webhook -> how many of its rows are claimed
+        self.wakeup = asyncio.Event()
+
+    def migrate_keyed_rows(self):
+        # Deliveries queued by versions that keyed entries by "{feed}::{sha256}" move over with a
+        # fingerprint; their old key is recorded as seen so the entry isn't queued a second time
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pending'").fetchone() is None:
+            return
+        self.seen.create_legacy_table()
+        now = time.time()
+        rows = self.conn.execute("SELECT key, webhook, item, attempts, next_attempt FROM pending ORDER BY id").fetchall()
+        for key, webhook, item, attempts, next_attempt in rows:
+            feed_url = key.split("::")[0]
+            self.conn.execute("INSERT OR IGNORE INTO seen (key, seen_at) VALUES (?, ?)", (key, now))
+            self.conn.execute(
+                "INSERT OR IGNORE INTO deliveries (fingerprint, webhook, item, attempts, next_attempt) VALUES (?, ?, ?, ?, ?)",
+                (entry_fingerprint(feed_url, json.loads(item)[5]), webhook, item, attempts, next_attempt)
+            )
+        self.conn.execute("DROP TABLE IF EXISTS pending")
+        self.conn.commit()
+        if rows:
+            logging.info(f"[Delivery] Migrated {len(rows)} queued deliveries to fingerprints")
+
+    def __contains__(self, fingerprint):
+        return self.conn.execute("SELECT 1 FROM deliveries WHERE fingerprint = ?", (fingerprint,)).fetchone() is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM deliveries").fetchone()[0]
+
+    @property
+    def in_flight(self):
+        return len(self.claimed)
+
+    def put(self, fingerprint, item):
+        """Queue (title, link, image, webhook, category, entry) under its fingerprint; False if already queued."""
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO deliveries (fingerprint, webhook, item) VALUES (?, ?, ?)",
+            (fingerprint, item[3], json.dumps(item))
+        )
+        self.wakeup.set()
+        return cur.rowcount == 1
+
+    def claim(self, limit):
+        """Oldest due deliveries not already in memory, as (row_id, item) pairs.
 
-def save_seen_entries(seen):
-    with open(SEEN_FILE, "w") as f:
-        for item in seen:
-            f.write(item + "\n")
+        Each webhook has at most DELIVERY_WEBHOOK_WINDOW rows in memory, counting
+        ones claimed earlier, so one webhook's backlog can't fill the whole window.
+        Rows are read per webhook from deliveries_due_idx, so a claim costs the same
+        however long the backlog is.
+        """
+        if limit <= 0:
+            return []
+        now = time.time()
+        candidates = []
+        for (webhook,) in self.conn.execute(
+            # Distinct webhooks by index seeks, one per webhook instead of one per row
+            "WITH RECURSIVE hooks (webhook) AS (SELECT MIN(webhook) FROM deliveries UNION ALL"
+            " SELECT (SELECT MIN(webhook) FROM deliveries WHERE webhook > hooks.webhook) FROM hooks"
+            " WHERE hooks.webhook IS NOT NULL) SELECT webhook FROM hooks WHERE webhook IS NOT NULL"
+        ).fetchall():
+            room = DELIVERY_WEBHOOK_WINDOW - self.held.get(webhook, 0)
+            if room <= 0 or not owns(webhook):
+                continue
+            candidates += self.conn.execute(
+                "SELECT id, webhook FROM deliveries WHERE webhook = ? AND claimed = 0 AND next_attempt <= ? "
+                "ORDER BY next_attempt, id LIMIT ?",
+                (webhook, now, min(room, limit))
+            ).fetchall()
+        candidates = sorted(candidates)[:limit]
+        with self.conn:
+            self.conn.executemany("UPDATE deliveries SET claimed = 1 WHERE id = ?", ((row_id,) for row_id, _ in candidates))
+        claimed = []
+        for row_id, webhook in candidates:
+            self.claimed[row_id] = webhook
+            self.held[webhook] = self.held.get(webhook, 0) + 1
+            item = self.conn.execute("SELECT item FROM deliveries WHERE id = ?", (row_id,)).fetchone()[0]
+            claimed.append((row_id, tuple(json.loads(item))))
+        return claimed
+
+    def release(self, row_ids):
+        for row_id in row_ids:
+            webhook = self.claimed.pop(row_id, None)
+            if webhook is not None:
+                self.held[webhook] -= 1
+                if not self.held[webhook]:
+                    del self.held[webhook]
+        self.wakeup.set()
+
+    def mark_delivered(self, row_ids):
+        now = time.time()
+        for row_id in row_ids:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (fingerprint, seen_at) SELECT fingerprint, ? FROM deliveries WHERE id = ?",
+                (now, row_id)
+            )
+            self.conn.execute("DELETE FROM deliveries WHERE id = ?", (row_id,))
+
+    def ack(self, row_ids):
+        """Delivery finished: mark the entries seen and drop them from the queue in one transaction."""
+        with self.conn:
+            self.mark_delivered(row_ids)
+        self.release(row_ids)
+
+    def retry(self, row_ids):
+        """Put failed deliveries back with exponential backoff; give up after DELIVERY_MAX_ATTEMPTS."""
+        now = time.time()
+        exhausted = []
+        with self.conn:
+            for row_id in row_ids:
+                row = self.conn.execute("SELECT attempts FROM deliveries WHERE id = ?", (row_id,)).fetchone()
+                if row is None:
+                    continue  # Already gone, nothing to put back
+                attempts = row[0] + 1
+                if attempts >= DELIVERY_MAX_ATTEMPTS:
+                    exhausted.append(row_id)
+                    continue
+                delay = min(DELIVERY_RETRY_DELAY * 2 ** (attempts - 1), DELIVERY_MAX_BACKOFF)
+                self.conn.execute(
+                    "UPDATE deliveries SET attempts = ?, next_attempt = ?, claimed = 0 WHERE id = ?",
+                    (attempts, now + delay, row_id)
+                )
+            self.mark_delivered(exhausted)
+        self.release(row_ids)
+        if exhausted:
+            logging.error(f"[Delivery] Giving up on {len(exhausted)} item(s) after {DELIVERY_MAX_ATTEMPTS} attempts")
+
+def load_seen_entries():
+    seen = SeenStore(SEEN_DB_FILE)
+    seen.import_legacy_file(SEEN_FILE)
+    expired = seen.expire(SEEN_RETENTION)
+    if expired:
+        logging.info(f"Expired {expired} seen entries older than {SEEN_RETENTION}s")
+    return seen
+
+async def save_seen_entries(seen):
+    await run_locked(seen.expire, SEEN_RETENTION)
+
+async def run_locked(func, *args):
+    """Run a write to the seen database, retrying while another worker holds the write lock.
+
+    Connections only busy-wait SQLITE_LOCK_WAIT on the event loop; after that the
+    write is retried after an asyncio.sleep, so a lock held elsewhere never stalls
+    sends or fetches. func must roll back its transaction when it fails. Gives up
+    after SQLITE_BUSY_TIMEOUT.
+    """
+    deadline = time.monotonic() + SQLITE_BUSY_TIMEOUT
+    while True:
+        try:
+            return func(*args)
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) or time.monotonic() >= deadline:
+                raise
+        await asyncio.sleep(SQLITE_LOCK_WAIT)
+
+def get_delivery_queue():
+    global delivery_queue
+    if delivery_queue is None:
+        delivery_queue = DeliveryQueue(load_seen_entries())
+    return delivery_queue
+
+def load_feed_cache():
+    try:
+        with open(FEED_CACHE_FILE, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_feed_cache(cache):
+    tmp_file = FEED_CACHE_FILE + ".tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_file, FEED_CACHE_FILE)
+
+def save_caches(force=False):
+    """Write the feed and og:image caches if they changed, at most every CACHE_SAVE_INTERVAL."""
+    now = time.monotonic()
+    if not force and now - cache_dirty["saved_at"] < CACHE_SAVE_INTERVAL:
+        return
+    if cache_dirty["feed"]:
+        save_feed_cache(feed_cache)
+        cache_dirty["feed"] = False
+    if cache_dirty["og_image"]:
+        save_og_image_cache(og_image_cache)
+        cache_dirty["og_image"] = False
+    cache_dirty["saved_at"] = now
+
+def load_og_image_cache():
+    try:
+        with open(OG_IMAGE_CACHE_FILE, "r") as f:
+            cache = OrderedDict(json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return OrderedDict()
+    now = time.time()
+    for url, (image, stored_at) in list(cache.items()):
+        if now - stored_at > (OG_IMAGE_CACHE_TTL if image else OG_IMAGE_NEGATIVE_TTL):
+            del cache[url]
+    return cache
+
+def save_og_image_cache(cache):
+    tmp_file = OG_IMAGE_CACHE_FILE + ".tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(list(cache.items()), f)
+    os.replace(tmp_file, OG_IMAGE_CACHE_FILE)
 
 def sanitize_url(url):
     parsed = urlparse(url)
@@ -81,11 +656,58 @@ def sanitize_url(url):
     new_query = '&'.join(f"{k}={v[0]}" for k, v in clean_query.items())
     return urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment))
 
+def canonical_url(url):
+    """Comparison form of a link, equal for the same article reached through different feeds.
+
+    Tracking parameters are stripped, the host is lowercased without "www." or a
+    default port, the path is normalized and the query sorted. Scheme and fragment
+    are dropped. Only used as a key; alerts keep the sanitized link.
+    """
+    parsed = urlparse(sanitize_url(url.strip()))
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS.get(parsed.scheme.lower()):
+        host += f":{port}"
+    path = posixpath.normpath(re.sub(r"/{2,}", "/", parsed.path)) if parsed.path else "/"
+    path = path.rstrip("/") or "/"
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+                             if k.lower() not in TRACKING_PARAMS))
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
 def hash_entry(title, link, published):
+    # Pre-fingerprint dedup key, only used to look up keys in the legacy seen table
     h = hashlib.sha256()
     h.update(f"{title}{link}{published}".encode())
     return h.hexdigest()
 
+def entry_fingerprint(feed_url, entry):
+    """Signed 64-bit identity of an entry within a feed, as stored in SQLite.
+
+    Based on the guid / Atom id, else the canonical link, so edited titles and
+    republished dates don't make an entry look new.
+    """
+    identity = entry.get("id") or sanitize_url(entry.get("link", ""))
+    if not identity:
+        identity = f"{entry.get('title', 'No Title')}\n{entry.get('published', '')}"
+    digest = hashlib.blake2b(f"{feed_url}\n{identity}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+def subscriber_fingerprint(fingerprint, webhook_url):
+    """Entry fingerprint of one subscriber, so each webhook of a feed is deduped on its own."""
+    # Keyed by webhook id rather than URL, so a regenerated token doesn't resend everything
+    digest = hashlib.blake2b(f"{fingerprint}\n{webhook_label(webhook_url)}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+def link_key(webhook_url, link):
+    """Signed 64-bit key of an article's canonical link in one webhook's recent-link index."""
+    digest = hashlib.blake2b(f"{webhook_label(webhook_url)}\n{canonical_url(link)}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
 def extract_image(entry):
     if "media_thumbnail" in entry:
         thumb = entry["media_thumbnail"]
@@ -97,12 +719,12 @@ def extract_image(entry):
         return entry["enclosures"][0].get("href")
     for key in ["summary", "description"]:
         content = entry.get(key, "")
-        match = re.search(r'<img[^>]+src="([^"]+)', content)
+        match = re.search(r'''<img[^>]+src=["']([^"']+)''', content)
         if match:
             return match.group(1)
     if "content" in entry:
         for content_item in entry["content"]:
-            match = re.search(r'<img[^>]+src="([^"]+)', content_item.get("value", ""))
+            match = re.search(r'''<img[^>]+src=["']([^"']+)''', content_item.get("value", ""))
             if match:
                 return match.group(1)
     if "youtube.com/watch" in entry.get("link", ""):
@@ -110,6 +732,98 @@ def extract_image(entry):
         return f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
     return None
 
+def find_og_image_soup(html):
+    """Full-document BeautifulSoup lookup; returns the raw image src or None."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Try og:image
+    og_tag = soup.find("meta", attrs={"property": "og:image"})
+    if og_tag and og_tag.get("content", ""):
+        return og_tag.get("content")
+
+    # Try twitter:image
+    twitter_tag = soup.find("meta", attrs={"name": "twitter:image"})
+    if twitter_tag and twitter_tag.get("content", ""):
+        return twitter_tag.get("content")
+
+    # Try first article image
+    article = soup.find("article")
+    if article:
+        img = article.find("img")
+        if img and img.get("src"):
+            return img.get("src")
+
+    # Fallback to any image
+    img = soup.find("img")
+    if img and img.get("src"):
+        return img.get("src")
+    return None
+
+class OgImageScanner(HTMLParser):
+    """Incremental tag scanner with the same priority as find_og_image_soup.
+
+    og:image ends the scan at once; twitter:image ends it at </head>; otherwise
+    the scan continues into the body until an <article><img> turns up or
+    OG_IMAGE_MAX_BYTES have been read.
+    """
+
+    def __init__(self, encoding="utf-8"):
+        super().__init__(convert_charrefs=True)
+        try:
+            self.decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        except LookupError:
+            self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.bytes_read = 0
+        self.og_image = None
+        self.twitter_image = None
+        self.article_image = None
+        self.first_image = None
+        self.article_depth = 0
+        self.head_done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            attrs = dict(attrs)
+            if attrs.get("property") == "og:image" and not self.og_image:
+                self.og_image = attrs.get("content")
+            elif attrs.get("name") == "twitter:image" and not self.twitter_image:
+                self.twitter_image = attrs.get("content")
+        elif tag == "body":
+            self.head_done = True
+        elif tag == "article":
+            self.article_depth += 1
+        elif tag == "img":
+            src = dict(attrs).get("src")
+            if src:
+                if self.article_depth and not self.article_image:
+                    self.article_image = src
+                if not self.first_image:
+                    self.first_image = src
+
+    def feed_bytes(self, chunk):
+        self.bytes_read += len(chunk)
+        self.feed(self.decoder.decode(chunk))
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.head_done = True
+        elif tag == "article" and self.article_depth:
+            self.article_depth -= 1
+
+    @property
+    def done(self):
+        if self.bytes_read >= OG_IMAGE_MAX_BYTES:
+            return True
+        return bool(self.og_image or (self.head_done and self.twitter_image) or self.article_image)
+
+    def best_image(self):
+        return self.og_image or self.twitter_image or self.article_image or self.first_image
+
+def scan_og_chunk(scanner, chunk):
+    # Returns the scanner because a process pool works on a copy of it
+    scanner.feed_bytes(chunk)
+    return scanner
+
 async def fetch_og_image(url):
     try:
         await create_session()
@@ -122,40 +836,41 @@ async def fetch_og_image(url):
             if resp.status != 200:
                 logging.warning(f"[IMAGE FETCH FAILED] Status {resp.status} for {url}")
                 return None
-                
-            html = await resp.text()
-            soup = BeautifulSoup(html, "html.parser")
-            
-            # Try og:image
-            og_tag = soup.find("meta", attrs={"property": "og:image"})
-            if og_tag:
-                img_url = og_tag.get("content", "")
-                if img_url:
-                    return urljoin(url, img_url)
-            
-            # Try twitter:image
-            twitter_tag = soup.find("meta", attrs={"name": "twitter:image"})
-            if twitter_tag:
-                img_url = twitter_tag.get("content", "")
-                if img_url:
-                    return urljoin(url, img_url)
-            
-            # Try first article image
-            article = soup.find("article")
-            if article:
-                img = article.find("img")
-                if img and img.get("src"):
-                    return urljoin(url, img.get("src"))
-                    
-            # Fallback to any image
-            img = soup.find("img")
-            if img and img.get("src"):
-                return urljoin(url, img.get("src"))
-                
+
+            if not OG_IMAGE_STREAMING:
+                img_url = await run_parse(find_og_image_soup, await resp.text())
+                return urljoin(url, img_url) if img_url else None
+
+            # Read only as much of the page as the scanner needs; the HTML scanning runs off the event loop
+            scanner = OgImageScanner(resp.charset or "utf-8")
+            async for chunk in resp.content.iter_chunked(OG_IMAGE_CHUNK_SIZE):
+                scanner = await run_parse(scan_og_chunk, scanner, chunk)
+                if scanner.done:
+                    break
+            img_url = scanner.best_image()
+            if img_url:
+                return urljoin(url, img_url)
+
     except Exception as e:
         logging.warning(f"[IMAGE FETCH FAILED] {url} :: {type(e).__name__} - {e}")
     return None
 
+async def resolve_og_image(url):
+    """fetch_og_image behind the persistent LRU+TTL cache; misses are cached too."""
+    cached = og_image_cache.get(url)
+    if cached:
+        image, stored_at = cached
+        if time.time() - stored_at <= (OG_IMAGE_CACHE_TTL if image else OG_IMAGE_NEGATIVE_TTL):
+            og_image_cache.move_to_end(url)
+            return image
+    image = await fetch_og_image(url)
+    og_image_cache[url] = [image, time.time()]
+    og_image_cache.move_to_end(url)
+    cache_dirty["og_image"] = True
+    while len(og_image_cache) > OG_IMAGE_CACHE_SIZE:
+        og_image_cache.popitem(last=False)
+    return image
+
 def is_recent(entry):
     published = entry.get("published_parsed")
     if not published:
@@ -176,6 +891,12 @@ async def close_session():
         await session.close()
 
 async def fetch_rss_content(url):
+    """Return (body, cache validators); body is None when unchanged since the last poll.
+
+    Validators of a changed body are only returned, not stored: the caller puts
+    them in feed_cache once the entries are processed, so a failed run polls the
+    body again instead of getting a 304.
+    """
     await create_session()
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
@@ -187,41 +908,70 @@ async def fetch_rss_content(url):
         "Connection": "keep-alive",
         "Upgrade-Insecure-Requests": "1"
     }
+    cached = feed_cache.get(url, {})
+    # A 304 has no body to find a hub in, so the first poll with WebSub on is unconditional
+    if not (websub_manager and websub_manager.needs_body(url)):
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
 
     try:
         async with session.get(url, headers=headers, timeout=10) as resp:
+            if resp.status == 304:
+                cache_stats["not_modified"] += 1
+                return None, None
             if resp.status == 200:
-                return await resp.text()
+                body = bytearray()
+                async for chunk in resp.content.iter_chunked(FEED_CHUNK_SIZE):
+                    body += chunk
+                    if len(body) >= MAX_FEED_BYTES:
+                        logging.warning(f"[{url}] Feed is larger than {MAX_FEED_BYTES} bytes, only the start is parsed")
+                        del body[MAX_FEED_BYTES:]
+                        break
+                content = body.decode(resp.charset or "utf-8", errors="replace")
+                if websub_manager:
+                    websub_manager.note_feed(url, content, resp.headers.get("Link"))
+                body_hash = hashlib.sha256(content.encode()).hexdigest()
+                validators = {
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                    "body_hash": body_hash
+                }
+                if body_hash == cached.get("body_hash"):
+                    if validators != cached:
+                        feed_cache[url] = validators
+                        cache_dirty["feed"] = True
+                    cache_stats["hash_hits"] += 1
+                    return None, None
+                return content, validators
             else:
                 logging.warning(f"Failed to fetch RSS from {url} (status {resp.status})")
     except Exception as e:
         logging.error(f"Error fetching RSS feed from {url}: {type(e).__name__} - {e}")
-    return ""
+    return "", None
 
-async def send_embed(title, link, image, webhook_url, category, entry):
+def build_message(title, link, image, category, entry):
     is_youtube = "youtube.com/watch" in link or "youtu.be/" in link
     if is_youtube:
-        channel_name = entry.get("author", "YouTube")
+        channel_name = entry.get("author") or "YouTube"
         message = f"New video from **{channel_name}**!\n{link}"
         data = {"content": message}
     else:
         source = urlparse(link).netloc.replace("www.", "")
         message = f"New article from **{source}**!"
-        
-        # Extract and clean description
-        raw_desc = entry.get("summary", "") or entry.get("description", "")
-        clean_desc = clean_html(raw_desc)
-        
-        # Truncate if too long (limit to 280 chars)
-        if len(clean_desc) > 280:
-            clean_desc = clean_desc[:277] + "..."
-            
+
+        # Description was cleaned and truncated by the parse worker
+        clean_desc = entry.get("description", "")
+
         # Add read more link
         if clean_desc:
             final_desc = f"{clean_desc}\n\n[Read full article]({link})"
         else:
             final_desc = f"[Click to read article]({link})"
 
+        if len(title) > MAX_EMBED_TITLE_CHARS:
+            title = title[:MAX_EMBED_TITLE_CHARS - 3] + "..."
         embed = {
             "title": title,
             "url": link,
@@ -233,128 +983,804 @@ async def send_embed(title, link, image, webhook_url, category, entry):
         if image and is_valid_image_url(image):
             embed["image"] = {"url": image}
         data = {"content": message, "embeds": [embed]}
-    try:
-        async with session.post(webhook_url, json=data) as resp:
-            if resp.status == 204:
-                logging.info(f"Sent: {title}")
+    return data
+
+def embed_length(embed):
+    # Characters Discord counts toward the 6000 per-message embed limit
+    length = len(embed.get("title", "")) + len(embed.get("description", ""))
+    length += len(embed.get("footer", {}).get("text", "")) + len(embed.get("author", {}).get("name", ""))
+    for field in embed.get("fields", []):
+        length += len(field.get("name", "")) + len(field.get("value", ""))
+    return length
+
+def coalesce_messages(messages):
+    """Merge (tag, payload) pairs into as few webhook payloads as Discord's limits allow.
+
+    Embed messages are packed up to 10 embeds / 6000 embed characters, and plain
+    content messages (YouTube) are joined with newlines up to 2000 characters.
+    Returns a list of (tags, payload) pairs; tags are passed through untouched.
+    """
+    batches = []
+    embed_batch = None
+    content_batch = None
+    for tag, data in messages:
+        if "embeds" in data:
+            size = sum(embed_length(embed) for embed in data["embeds"])
+            if embed_batch and (
+                len(embed_batch["embeds"]) + len(data["embeds"]) > MAX_EMBEDS_PER_MESSAGE
+                or embed_batch["chars"] + size > MAX_EMBED_CHARS_PER_MESSAGE
+            ):
+                batches.append(embed_batch)
+                embed_batch = None
+            if embed_batch is None:
+                embed_batch = {"tags": [], "lines": [], "embeds": [], "chars": 0}
+            embed_batch["tags"].append(tag)
+            if data.get("content") and data["content"] not in embed_batch["lines"]:
+                embed_batch["lines"].append(data["content"])
+            embed_batch["embeds"].extend(data["embeds"])
+            embed_batch["chars"] += size
+        else:
+            if content_batch and len(content_batch["content"]) + 1 + len(data["content"]) > MAX_CONTENT_CHARS:
+                batches.append(content_batch)
+                content_batch = None
+            if content_batch is None:
+                content_batch = {"tags": [tag], "content": data["content"]}
             else:
-                logging.warning(f"Failed to send ({resp.status})")
+                content_batch["tags"].append(tag)
+                content_batch["content"] += "\n" + data["content"]
+    if embed_batch:
+        batches.append(embed_batch)
+    if content_batch:
+        batches.append(content_batch)
+
+    payloads = []
+    for batch in batches:
+        if "embeds" in batch:
+            payload = {"embeds": batch["embeds"]}
+            if batch["lines"]:
+                payload["content"] = "\n".join(batch["lines"])[:MAX_CONTENT_CHARS]
+        else:
+            payload = {"content": batch["content"]}
+        payloads.append((batch["tags"], payload))
+    return payloads
+
+async def send_batch(webhook_url, items):
+    """Send items as few messages as possible; returns (item indices, status) per message sent."""
+    messages = [(index, build_message(title, link, image, category, entry))
+                for index, (title, link, image, _, category, entry) in enumerate(items)]
+    results = []
+    for indices, payload in coalesce_messages(messages):
+        status = await post_webhook(webhook_url, payload)
+        if status is not None and len(indices) > 1 and 400 <= status < 500 and status != 429:
+            # Discord rejects the whole message for one bad embed; find it by sending the items one at a time
+            logging.warning(f"Coalesced message of {len(indices)} items rejected ({status}), sending them separately")
+            results.extend(await send_batch_separately(webhook_url, items, indices, messages))
+            continue
+        if status == 204:
+            logging.info(f"Sent: {' | '.join(items[index][0] for index in indices)}")
+        elif status is not None:
+            logging.warning(f"Failed to send {len(indices)} item(s) ({status})")
+        results.append((indices, status))
+    return results
+
+async def send_batch_separately(webhook_url, items, indices, messages):
+    results = []
+    for index in indices:
+        status = await post_webhook(webhook_url, messages[index][1])
+        if status == 204:
+            logging.info(f"Sent: {items[index][0]}")
+        elif status is not None:
+            logging.warning(f"Failed to send {items[index][0]!r} ({status})")
+        results.append(([index], status))
+    return results
+
+async def send_embed(title, link, image, webhook_url, category, entry):
+    return (await send_batch(webhook_url, [(title, link, image, webhook_url, category, entry)]))[0][1]
+
+def webhook_label(webhook_url):
+    # Discord webhook URLs end in /webhooks/<id>/<token>; only the id is safe to expose
+    parts = urlparse(webhook_url).path.strip("/").split("/")
+    if "webhooks" in parts and parts.index("webhooks") + 1 < len(parts):
+        return parts[parts.index("webhooks") + 1]
+    return urlparse(webhook_url).netloc + urlparse(webhook_url).path
+
+def get_webhook_bucket(webhook_url):
+    if webhook_url not in webhook_buckets:
+        webhook_buckets[webhook_url] = {"remaining": None, "reset_at": 0.0}
+    return webhook_buckets[webhook_url]
+
+def update_webhook_bucket(bucket, headers):
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset_after = headers.get("X-RateLimit-Reset-After")
+    if remaining is not None and reset_after is not None:
+        bucket["remaining"] = int(remaining)
+        bucket["reset_at"] = time.monotonic() + float(reset_after)
+
+def get_shared_send_conn():
+    global shared_send_conn
+    if shared_send_conn is None:
+        # Autocommit connection so each reservation is its own short BEGIN IMMEDIATE transaction
+        conn = sqlite3.connect(SEEN_DB_FILE, timeout=SQLITE_LOCK_WAIT, isolation_level=None)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS send_state (id INTEGER PRIMARY KEY CHECK (id = 0), "
+            "next_slot REAL NOT NULL, paused_until REAL NOT NULL)"
+        )
+        conn.execute("INSERT OR IGNORE INTO send_state VALUES (0, 0, 0)")
+        shared_send_conn = conn  # Only once set up, so a locked first attempt is simply retried
+    return shared_send_conn
+
+def reserve_shared_slot():
+    """Reserve the next global send slot across all workers; returns seconds to wait for it."""
+    conn = get_shared_send_conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        next_slot, paused_until = conn.execute("SELECT next_slot, paused_until FROM send_state").fetchone()
+        now = time.time()
+        slot = max(now, next_slot, paused_until)
+        conn.execute("UPDATE send_state SET next_slot = ?", (slot + 1 / GLOBAL_SEND_RATE,))
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    return slot - now
+
+async def pause_global_sends(retry_after):
+    global_send_state["paused_until"] = time.monotonic() + retry_after
+    if WORKER_COUNT > 1:
+        await run_locked(
+            get_shared_send_conn().execute,
+            "UPDATE send_state SET paused_until = MAX(paused_until, ?)", (time.time() + retry_after,)
+        )
+
+async def wait_for_global_slot():
+    if WORKER_COUNT > 1:
+        # Workers share one bot-wide budget, so the slot is reserved in the seen database
+        delay = await run_locked(reserve_shared_slot)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return
+    # Reserve the next global send slot; no await between read and write, so reservations never overlap
+    now = time.monotonic()
+    slot = max(now, global_send_state["next_slot"], global_send_state["paused_until"])
+    global_send_state["next_slot"] = slot + 1 / GLOBAL_SEND_RATE
+    if slot > now:
+        await asyncio.sleep(slot - now)
+
+async def get_retry_after(resp):
+    try:
+        data = await resp.json(content_type=None)
+        return float(data.get("retry_after", 1)), bool(data.get("global", False))
+    except Exception:
+        return float(resp.headers.get("Retry-After", 1)), resp.headers.get("X-RateLimit-Global") == "true"
+
+async def post_webhook(webhook_url, payload):
+    """POST a payload to a webhook within Discord's rate limits, retrying on 429.
+
+    Returns the final HTTP status, or None if the request could not be made.
+    """
+    await create_session()
+    bucket = get_webhook_bucket(webhook_url)
+    for attempt in range(MAX_SEND_RETRIES + 1):
+        now = time.monotonic()
+        if bucket["remaining"] == 0 and bucket["reset_at"] > now:
+            await asyncio.sleep(bucket["reset_at"] - now)
+        await wait_for_global_slot()
+        try:
+            send_start = time.monotonic()
+            async with session.post(webhook_url, json=payload) as resp:
+                SEND_SECONDS.observe(time.monotonic() - send_start)
+                WEBHOOK_RESPONSES.inc(webhook=webhook_label(webhook_url),
+                                      status="429" if resp.status == 429 else f"{resp.status // 100}xx")
+                update_webhook_bucket(bucket, resp.headers)
+                if resp.status != 429:
+                    return resp.status
+                retry_after, is_global = await get_retry_after(resp)
+        except Exception as e:
+            logging.error(f"[ERROR] {e}")
+            return None
+        if is_global:
+            await pause_global_sends(retry_after)
+        if attempt < MAX_SEND_RETRIES:
+            logging.warning(f"Rate limited ({'global' if is_global else 'webhook'}), retrying in {retry_after:.2f}s")
+            await asyncio.sleep(retry_after)
+    return 429
+
+async def webhook_lane(webhook_url, lane_queue):
+    pending = get_delivery_queue()
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(lane_queue.get(), LANE_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                if lane_queue.empty():
+                    return
+                continue
+            # Give a burst from one or more feeds a moment to arrive, then send it as few messages
+            batch = [item]
+            deadline = time.monotonic() + COALESCE_WINDOW
+            while len(batch) < MAX_EMBEDS_PER_MESSAGE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(lane_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                results = await send_batch(webhook_url, [item for _, item in batch])
+            except Exception as e:
+                logging.error(f"[ERROR] Delivery failed: {type(e).__name__} - {e}")
+                results = [(range(len(batch)), None)]
+            for indices, status in results:
+                row_ids = [batch[index][0] for index in indices]
+                try:
+                    # Other 4xx answers won't change on a resend, so they count as handled
+                    if status is None or status == 429 or status >= 500:
+                        await run_locked(pending.retry, row_ids)
+                    else:
+                        await run_locked(pending.ack, row_ids)
+                except Exception as e:
+                    # Requeued so they aren't lost; an acknowledged one may be sent again
+                    logging.error(f"[Delivery] Could not record {len(row_ids)} delivery result(s) for "
+                                  f"{webhook_label(webhook_url)}: {type(e).__name__} - {e}")
+                    await requeue_rows(pending, row_ids)
+    except Exception as e:
+        logging.error(f"[Delivery] Lane for {webhook_label(webhook_url)} stopped: {type(e).__name__} - {e}")
+    finally:
+        # No await until the rows are collected, so none are handed to this lane after it has stopped
+        if webhook_lanes.get(webhook_url, (None,))[0] is lane_queue:
+            del webhook_lanes[webhook_url]
+        # Every row of this webhook still in memory was this lane's; they go back with a retry backoff
+        await requeue_rows(pending, [row_id for row_id, webhook in pending.claimed.items() if webhook == webhook_url])
+
+async def requeue_rows(pending, row_ids):
+    """Retry rows a lane couldn't finish; they leave memory even if that fails, so the window never fills up."""
+    if not row_ids:
+        return
+    try:
+        await run_locked(pending.retry, row_ids)
     except Exception as e:
-        logging.error(f"[ERROR] {e}")
+        logging.error(f"[Delivery] Could not requeue {len(row_ids)} item(s), they resume after a restart: "
+                      f"{type(e).__name__} - {e}")
+    finally:
+        pending.release(row_ids)
 
 async def sender_worker():
     await create_session()
+    pending = get_delivery_queue()
+    backlog = len(pending)
+    if backlog:
+        logging.info(f"[Delivery] Resuming {backlog} pending deliveries")
     while True:
-        item = await queue.get()
-        await send_embed(*item)
-        await asyncio.sleep(SEND_INTERVAL)
+        pending.wakeup.clear()
+        claimed = await run_locked(pending.claim, DELIVERY_WINDOW - pending.in_flight)
+        for row_id, item in claimed:
+            # One lane per webhook: each delivers in order at its own rate limit
+            webhook_url = item[3]
+            if webhook_url not in webhook_lanes:
+                lane_queue = asyncio.Queue()
+                webhook_lanes[webhook_url] = (lane_queue, asyncio.create_task(webhook_lane(webhook_url, lane_queue)))
+            webhook_lanes[webhook_url][0].put_nowait((row_id, item))
+        if not claimed:
+            try:
+                await asyncio.wait_for(pending.wakeup.wait(), DELIVERY_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
 
-async def rss_checker():
-    seen = load_seen_entries()
-    while True:
-        feeds = load_config()
-        logging.info("Checking feeds...")
-        await send_discord_notification("RSS Bot is checking feeds now...")
-        for url, config in feeds.items():
-            if url.startswith("twitch:"):
+def get_host_semaphore(host):
+    if host not in host_semaphores:
+        host_semaphores[host] = asyncio.Semaphore(MAX_FETCHES_PER_HOST)
+    return host_semaphores[host]
+
+async def fetch_feed(url, config):
+    # Take the per-host slot first so a busy origin doesn't hold global slots while it waits
+    host = urlparse(url).netloc.lower()
+    async with get_host_semaphore(host):
+        async with fetch_semaphore:
+            start = time.monotonic()
+            content, validators = await fetch_rss_content(url)
+            elapsed = time.monotonic() - start
+            FEED_FETCH_SECONDS.observe(elapsed, feed=url)
+            if content:
+                FEED_RESPONSE_BYTES.observe(len(content))
+            return url, config, content, validators, elapsed
+
+def compact_entry(entry):
+    """Reduce a feedparser entry to the fields the pipeline uses."""
+    raw_desc = entry.get("summary", "") or entry.get("description", "")
+    # Truncate if too long (limit to 280 chars)
+    clean_desc = clean_html(raw_desc, max_chars=280)
+    return {
+        "id": entry.get("id"),
+        "title": entry.get("title", "No Title"),
+        "link": entry.get("link", ""),
+        "published": entry.get("published", ""),
+        "author": entry.get("author"),
+        "description": clean_desc,
+        "image": extract_image(entry)
+    }
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+MEDIA_NS = "{http://search.yahoo.com/mrss/}"
+CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+DC_CREATOR = "{http://purl.org/dc/elements/1.1/}creator"
+
+class StreamFallback(Exception):
+    """The feed needs feedparser: not plain RSS 2.0 / Atom, malformed, or using constructs we don't map."""
+
+def parse_entry_date(value):
+    """published_parsed the way feedparser fills it (UTC struct_time) for RFC 822 and ISO 8601 dates."""
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            raise StreamFallback(f"unknown date format {value!r}")
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).timetuple()
+
+def add_media(entry, element):
+    if element.tag == MEDIA_NS + "thumbnail":
+        entry.setdefault("media_thumbnail", []).append({"url": element.get("url")})
+    elif element.tag == MEDIA_NS + "content":
+        entry.setdefault("media_content", []).append({"url": element.get("url")})
+    elif element.tag == MEDIA_NS + "description":
+        entry["media_description"] = (element.text or "").strip()
+    elif element.tag == MEDIA_NS + "group":
+        for child in element:
+            add_media(entry, child)
+
+def rss_item_entry(item):
+    entry = {}
+    guid = None
+    for child in item:
+        text = (child.text or "").strip()
+        if child.tag == "title":
+            entry["title"] = text
+        elif child.tag == "link":
+            entry["link"] = text
+        elif child.tag == "guid":
+            entry["id"] = text
+            if child.get("isPermaLink", "true") != "false":
+                guid = text
+        elif child.tag == "pubDate":
+            entry["published"] = text
+        elif child.tag == "description":
+            entry["summary"] = text
+        elif child.tag in ("author", DC_CREATOR):
+            entry["author"] = text
+        elif child.tag == CONTENT_ENCODED:
+            entry.setdefault("content", []).append({"value": text})
+        elif child.tag == "enclosure":
+            entry.setdefault("enclosures", []).append({"href": child.get("url")})
+        else:
+            add_media(entry, child)
+    if "link" not in entry and guid:
+        entry["link"] = guid
+    return entry
+
+def atom_entry(element):
+    entry = {}
+    for child in element:
+        if child.get("type") == "xhtml":
+            raise StreamFallback("xhtml content")
+        text = (child.text or "").strip()
+        if child.tag == ATOM_NS + "title":
+            entry["title"] = text
+        elif child.tag == ATOM_NS + "id":
+            entry["id"] = text
+        elif child.tag == ATOM_NS + "link":
+            rel = child.get("rel", "alternate")
+            if rel == "alternate" and "link" not in entry:
+                entry["link"] = child.get("href", "")
+            elif rel == "enclosure":
+                entry.setdefault("enclosures", []).append({"href": child.get("href")})
+        elif child.tag == ATOM_NS + "published":
+            entry["published"] = text
+        elif child.tag == ATOM_NS + "summary":
+            entry["summary"] = text
+        elif child.tag == ATOM_NS + "content":
+            entry.setdefault("content", []).append({"value": text})
+        elif child.tag == ATOM_NS + "author" and "author" not in entry:
+            entry["author"] = (child.findtext(ATOM_NS + "name") or "").strip()
+        else:
+            add_media(entry, child)
+    if entry.get("link") and not urlparse(entry["link"]).scheme:
+        raise StreamFallback("relative link")
+    return entry
+
+def iter_stream_entries(feed_content):
+    """Yield feedparser-style entry dicts from an RSS 2.0 or Atom body while it is parsed.
+
+    Each item is dropped from the tree once read, so memory doesn't grow with the
+    number of items, and a caller that stops early never parses the rest.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    container = None
+    for offset in range(0, len(feed_content), FEED_CHUNK_SIZE):
+        try:
+            parser.feed(feed_content[offset:offset + FEED_CHUNK_SIZE])
+            events = list(parser.read_events())
+        except ET.ParseError as e:
+            raise StreamFallback(str(e))
+        for event, element in events:
+            if event == "start":
+                if container is None:
+                    if element.tag not in ("rss", ATOM_NS + "feed"):
+                        raise StreamFallback(f"unsupported root {element.tag}")
+                    container = element
+                elif element.tag == "channel":
+                    container = element
                 continue
-            webhook = config["webhook"]
-            category = config.get("category", "RSS")
-            feed_content = await fetch_rss_content(url)
-            parsed = feedparser.parse(feed_content)
-            # Filter for entries from the last 24 hours
-            entries_recent = [e for e in parsed.entries if is_recent(e)]
-            
-            if not entries_recent:
-                logging.info(f"[{url}] No recent entries (last 24h).")
+            if element.tag == "item":
+                entry = rss_item_entry(element)
+            elif element.tag == ATOM_NS + "entry":
+                entry = atom_entry(element)
+            else:
                 continue
-                
-            for entry in entries_recent[:5]: # Limit to 5 to avoid spamming on startup
-                title = entry.get("title", "No Title")
-                link = sanitize_url(entry.get("link", ""))
-                published = entry.get("published", "")
-                image = extract_image(entry)
-                if not image:
-                    image = await fetch_og_image(link)
-                if image and not is_valid_image_url(image):
-                    image = None
-                entry_hash = hash_entry(title, link, published)
-                key = f"{url}::{entry_hash}"
-                if key in seen:
-                    continue
-                seen.add(key)
-                await queue.put((title, link, image, webhook, category, entry))
-        save_seen_entries(seen)
-        logging.info(f"Cycle complete. Sleeping {RSS_CHECK_INTERVAL}s\n")
-        await asyncio.sleep(RSS_CHECK_INTERVAL)
+            # feedparser uses media:description when an item has no summary, content when it has neither
+            media_description = entry.pop("media_description", None)
+            if "summary" not in entry:
+                if media_description is not None:
+                    entry["summary"] = media_description
+                elif entry.get("content"):
+                    entry["summary"] = entry["content"][0]["value"]
+            elif media_description is not None:
+                raise StreamFallback("both description and media:description")
+            if entry.get("published"):
+                entry["published_parsed"] = parse_entry_date(entry["published"])
+            if element in container:
+                container.remove(element)
+            yield entry
+
+def select_entries(entries, feed_url, known_fingerprints):
+    """Compact records of the newest recent entries of a feed, at most MAX_ENTRIES_PER_FEED.
+
+    While dates run newest-first, the scan stops after MAX_ENTRIES_PER_FEED recent
+    entries, at an entry of the previous poll, or after STALE_ENTRIES_BEFORE_STOP
+    entries older than 24h in a row. Feeds with a pinned item or in oldest-first
+    order are read to the end, skipping entries of the previous poll.
+    """
+    selected = []
+    stale = 0
+    newest_first = True
+    previous = None  # Date of the last dated entry
+    compared = False  # At least two dated entries seen, so the order is known
+    for entry in entries:
+        published = entry.get("published_parsed")
+        if published:
+            if previous is not None:
+                compared = True
+                if tuple(published[:6]) > previous:
+                    newest_first = False
+            previous = tuple(published[:6])
+        if known_fingerprints and entry_fingerprint(feed_url, entry) in known_fingerprints:
+            if newest_first and compared:
+                break
+            continue
+        if not is_recent(entry):
+            stale += 1
+            if newest_first and stale >= STALE_ENTRIES_BEFORE_STOP:
+                break
+            continue
+        stale = 0
+        selected.append(entry)
+        if newest_first and len(selected) >= MAX_ENTRIES_PER_FEED:
+            break
+    if not newest_first:
+        # Recent entries always have a date
+        selected.sort(key=lambda entry: tuple(entry["published_parsed"][:6]), reverse=True)
+    return [compact_entry(entry) for entry in selected[:MAX_ENTRIES_PER_FEED]]
+
+def parse_feed(feed_content, feed_url="", known_fingerprints=()):
+    """Runs in the parse executor: raw feed body -> compact records of its new recent entries."""
+    if FEED_STREAMING:
+        try:
+            return select_entries(iter_stream_entries(feed_content), feed_url, known_fingerprints)
+        except StreamFallback:
+            pass
+    return select_entries(feedparser.parse(feed_content).entries, feed_url, known_fingerprints)
+
+def get_parse_executor():
+    global parse_executor
+    if parse_executor is None:
+        if PARSE_EXECUTOR == "process":
+            parse_executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        else:
+            parse_executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+    return parse_executor
+
+async def run_parse(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_parse_executor(), func, *args)
+
+async def loop_lag_monitor():
+    # A sleep that wakes up late means something held the event loop
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        lag = loop.time() - start - LOOP_LAG_INTERVAL
+        loop_lag_stats["max"] = max(loop_lag_stats["max"], lag)
+        EVENT_LOOP_LAG.set(lag)
+        if lag > LOOP_LAG_WARNING:
+            logging.warning(f"[Loop] Event loop lagged {lag * 1000:.0f}ms")
+
+def queue_entry(seen, pending, targets, title, link, image, entry):
+    """Queue an entry for its subscribers in one transaction; returns (queued, suppressed) counts."""
+    queued = suppressed = 0
+    with seen.conn:
+        for target, webhook, category in targets:
+            # The same article from another feed, or under another guid, is posted to a webhook only once
+            if RECENT_LINK_TTL and link and not seen.claim_link(link_key(webhook, link), RECENT_LINK_TTL):
+                seen.add(target)
+                suppressed += 1
+            # Each fingerprint is marked seen once its delivery is acknowledged
+            elif pending.put(target, (title, link, image, webhook, category, entry)):
+                queued += 1
+    return queued, suppressed
+
+async def process_feed(url, config, feed_content, seen):
+    """Queue unseen recent entries of a feed for each subscriber and return how many entries were queued."""
+    if feed_content is None:
+        return 0
+    subscriptions = feed_subscriptions(config)
+    state = feed_state.get(url, {})
+    parse_start = time.monotonic()
+    entries_recent = await run_parse(parse_feed, feed_content, url, state.get("known_fingerprints", ()))
+    FEED_PARSE_SECONDS.observe(time.monotonic() - parse_start)
+
+    if not entries_recent:
+        logging.info(f"[{url}] No new recent entries (last 24h).")
+        return 0
+
+    pending = get_delivery_queue()
+    new_entries = 0
+    fingerprints = []
+    for entry in entries_recent:
+        title = entry["title"]
+        link = sanitize_url(entry["link"])
+        published = entry["published"]
+        fingerprint = entry_fingerprint(url, entry)
+        fingerprints.append(fingerprint)
+        # Dedup before any image work so seen entries never trigger an article fetch
+        targets = []
+        for webhook, category in subscriptions:
+            target = subscriber_fingerprint(fingerprint, webhook)
+            if target not in seen and target not in pending:
+                targets.append((target, webhook, category))
+        if not targets:
+            continue
+        if (fingerprint in seen or fingerprint in pending
+                or seen.seen_legacy(f"{url}::{hash_entry(title, link, published)}")):
+            await run_locked(seen.add_all, [target for target, _, _ in targets])
+            continue
+        # The image is resolved before any write, so no transaction is open across the await
+        image = entry["image"]
+        # No article fetch when every subscriber already has this link queued
+        if not image and not (RECENT_LINK_TTL and link and all(
+                seen.link_queued(link_key(webhook, link), RECENT_LINK_TTL) for _, webhook, _ in targets)):
+            image = await resolve_og_image(link)
+        if image and not is_valid_image_url(image):
+            image = None
+        queued, suppressed = await run_locked(queue_entry, seen, pending, targets, title, link, image, entry)
+        if suppressed:
+            link_stats["suppressed"] += suppressed
+            DUPLICATE_LINKS_TOTAL.inc(suppressed)
+        new_entries += queued > 0
+    if url in feed_state:
+        # The next parse stops as soon as it reaches one of these
+        feed_state[url]["known_fingerprints"] = frozenset(fingerprints)
+    return new_entries
+
+def log_cycle_summary(fetch_times, wall_time):
+    count = len(fetch_times)
+    rate = count / wall_time if wall_time > 0 else 0.0
+    logging.info(f"[Cycle] Fetched {count} feeds in {wall_time:.2f}s ({rate:.1f} feeds/s)")
+    host_times = {}
+    for url, elapsed in fetch_times:
+        host = urlparse(url).netloc.lower()
+        host_times[host] = max(host_times.get(host, 0.0), elapsed)
+    slowest = sorted(host_times.items(), key=lambda item: item[1], reverse=True)[:SLOWEST_HOSTS_REPORTED]
+    if slowest:
+        logging.info("[Cycle] Slowest hosts: " + ", ".join(f"{host} ({elapsed:.2f}s)" for host, elapsed in slowest))
+    logging.info(f"[Cycle] Max event loop lag since last cycle: {loop_lag_stats['max'] * 1000:.0f}ms")
+    loop_lag_stats["max"] = 0.0
+
+def sync_feed_schedule(old_feeds, feeds, now):
+    # Only feeds added or removed since the previous snapshot touch the schedule
+    added, removed, _ = diff_config(old_feeds, feeds)
+    for url in added:
+        if url.startswith("twitch:"):
+            continue
+        # New feeds are polled right away, then settle into their own interval
+        feed_state[url] = {
+            "interval": feeds[url].get("poll_interval", RSS_CHECK_INTERVAL),
+            "errors": 0,
+            "due": now
+        }
+        heapq.heappush(feed_schedule, (now, url))
+    for url in removed:
+        feed_state.pop(url, None)
+
+def pop_due_feeds(now):
+    due = []
+    while feed_schedule and feed_schedule[0][0] <= now:
+        due_time, url = heapq.heappop(feed_schedule)
+        # Skip heap entries left behind by removed or rescheduled feeds
+        state = feed_state.get(url)
+        if state and state["due"] == due_time:
+            due.append(url)
+    return due
+
+def reschedule_feed(url, config, new_entries, failed, now):
+    state = feed_state.get(url)
+    if state is None:
+        return
+    min_interval = config.get("min_interval", FEED_MIN_INTERVAL)
+    max_interval = config.get("max_interval", FEED_MAX_INTERVAL)
+    if failed:
+        state["errors"] += 1
+        delay = max(state["interval"], min(state["interval"] * 2 ** state["errors"], FEED_MAX_BACKOFF))
+    else:
+        state["errors"] = 0
+        if "poll_interval" in config:
+            interval = config["poll_interval"]
+        elif new_entries:
+            interval = state["interval"] / 2
+        else:
+            interval = state["interval"] * 1.25
+        state["interval"] = delay = min(max(interval, min_interval), max_interval)
+        if websub_manager and websub_manager.is_active(url):
+            # Pushes deliver new entries; polling only backs up a hub that misses one
+            delay = max(delay, WEBSUB_POLL_INTERVAL)
+    # Jitter keeps feeds from drifting back into one burst
+    state["due"] = now + delay * random.uniform(0.9, 1.1)
+    heapq.heappush(feed_schedule, (state["due"], url))
+
+async def check_due_feeds(feeds, due_urls, seen):
+    cycle_start = time.monotonic()
+    cache_stats["not_modified"] = cache_stats["hash_hits"] = 0
+    link_stats["suppressed"] = 0
+    fetch_times = []
+
+    async def check_feed(url):
+        # Each feed goes on to the entry stage as soon as its own fetch finishes,
+        # so parses of different feeds overlap in the parse executor
+        url, config, feed_content, validators, elapsed = await fetch_feed(url, feeds[url])
+        fetch_times.append((url, elapsed))
+        new_entries = 0
+        try:
+            new_entries = await process_feed(url, config, feed_content, seen)
+            if validators:
+                feed_cache[url] = validators
+                cache_dirty["feed"] = True
+        except Exception as e:
+            logging.error(f"Error processing feed {url}: {type(e).__name__} - {e}")
+        reschedule_feed(url, config, new_entries, feed_content == "", time.monotonic())
+        return new_entries
+
+    cycle_new_entries = sum(await asyncio.gather(*(check_feed(url) for url in due_urls)))
+    NEW_ENTRIES_TOTAL.inc(cycle_new_entries)
+    CYCLE_NEW_ENTRIES.set(cycle_new_entries)
+    log_cycle_summary(fetch_times, time.monotonic() - cycle_start)
+    logging.info(f"[Cycle] Unchanged feeds skipped: {cache_stats['not_modified']} not modified (304), "
+                 f"{cache_stats['hash_hits']} body hash hits")
+    if link_stats["suppressed"]:
+        logging.info(f"[Cycle] Suppressed {link_stats['suppressed']} duplicate links already queued for the same webhook")
+    await save_seen_entries(seen)
+    save_caches()
+
+async def rss_checker():
+    global feed_cache, og_image_cache
+    seen = get_delivery_queue().seen
+    feed_cache = load_feed_cache()
+    og_image_cache = load_og_image_cache()
+    last_notification = None
+    feeds = MappingProxyType({})
+    while True:
+        old_feeds, feeds = feeds, load_config()
+        now = time.monotonic()
+        if feeds is not old_feeds:
+            sync_feed_schedule(old_feeds, feeds, now)
+        due_urls = pop_due_feeds(now)
+        if due_urls:
+            logging.info(f"Checking {len(due_urls)} due feeds...")
+            if WORKER_INDEX == 0 and (last_notification is None or now - last_notification >= RSS_CHECK_INTERVAL):
+                await send_discord_notification("RSS Bot is checking feeds now...")
+                last_notification = now
+            await check_due_feeds(feeds, due_urls, seen)
+        next_due = feed_schedule[0][0] if feed_schedule else now + SCHEDULER_TICK
+        delay = min(max(next_due - time.monotonic(), 0), SCHEDULER_TICK)
+        if due_urls:
+            logging.info(f"Cycle complete. Next check in {delay:.0f}s\n")
+        await asyncio.sleep(delay)
+
+async def handle_websub_content(url, feed_content):
+    config = load_config().get(url)
+    if config is None:
+        return
+    new_entries = await process_feed(url, config, feed_content, get_delivery_queue().seen)
+    NEW_ENTRIES_TOTAL.inc(new_entries)
+    logging.info(f"[WebSub] Push for {url} queued {new_entries} new entries")
+
+async def websub_worker():
+    global websub_manager
+    await create_session()
+    websub_manager = WebSubManager(session, handle_websub_content)
+    # Sharded workers listen on consecutive ports starting at WEBSUB_PORT
+    await websub_manager.start_server(WEBSUB_HOST, WEBSUB_PORT + WORKER_INDEX, MAX_FEED_BYTES)
+    while True:
+        feed_urls = [url for url in load_config() if not url.startswith("twitch:")]
+        try:
+            await websub_manager.sync(feed_urls)
+        except Exception as e:
+            logging.error(f"[WebSub] Subscription sync failed: {type(e).__name__} - {e}")
+        await asyncio.sleep(WEBSUB_SYNC_INTERVAL)
+
+def get_twitch_provider():
+    global twitch_provider
+    if twitch_provider is None:
+        twitch_provider = create_provider(session, max_concurrent=TWITCH_MAX_CONCURRENT_CHECKS)
+        logging.info(f"[Twitch] Using {twitch_provider.name} provider")
+    return twitch_provider
 
 async def twitch_checker():
-    global twitch_last_live
     await create_session()
     while True:
         feeds = load_config()
         twitch_feeds = {k: v for k, v in feeds.items() if k.startswith("twitch:")}
         logging.info(f"[Twitch] Loaded {len(twitch_feeds)} twitch feeds")
+        start = time.monotonic()
+        channels = [key.split("twitch:")[1] for key in twitch_feeds]
+        try:
+            streams = await get_twitch_provider().get_streams(channels)
+        except Exception as e:
+            logging.error(f"[Twitch Check ERROR] {type(e).__name__} - {e}")
+            streams = {}
+        alerts = []
         for twitch_key, config in twitch_feeds.items():
             channel = twitch_key.split("twitch:")[1]
-            webhook = config["webhook"]
-            # logging.info(f"[Twitch] Checking live status for: {channel}")
-            try:
-                uptime = await twitch_check_uptime(channel)
-                
-                if "not found" in uptime.lower():
-                    logging.warning(f"[Twitch] Channel not found: {channel}")
-                    continue
+            # Channels that don't exist or couldn't be checked are left out
+            if channel.lower() not in streams:
+                continue
+            stream = streams[channel.lower()]
+            is_live = stream is not None
 
-                is_live = "offline" not in uptime.lower()
-                
-                if is_live and not twitch_last_live.get(channel, False):
-                    logging.info(f"[Twitch] {channel} is LIVE! Sending alert...")
-                    sent = await send_twitch_alert(channel, webhook)
-                    if sent:
-                        twitch_last_live[channel] = True
-                elif not is_live:
-                    if twitch_last_live.get(channel, False):
-                        logging.info(f"[Twitch] {channel} went offline.")
-                    twitch_last_live[channel] = False
-            except Exception as e:
-                logging.error(f"[Twitch Check ERROR] {channel}: {e}")
+            if is_live and not twitch_last_live.get(channel, False):
+                logging.info(f"[Twitch] {channel} is LIVE! Sending alert...")
+                alerts.append(send_twitch_alert(channel, config["webhook"], stream))
+            elif not is_live:
+                if twitch_last_live.get(channel, False):
+                    logging.info(f"[Twitch] {channel} went offline.")
+                twitch_last_live[channel] = False
+        await asyncio.gather(*alerts)
+        TWITCH_CHECK_SECONDS.observe(time.monotonic() - start)
+        logging.info(f"[Twitch] Checked {len(twitch_feeds)} channels in {time.monotonic() - start:.2f}s")
         await asyncio.sleep(TWITCH_CHECK_INTERVAL)
 
-async def twitch_check_uptime(channel):
-    url = f"https://decapi.me/twitch/uptime/{channel}"
-    async with session.get(url) as resp:
-        return await resp.text()
-
-async def twitch_check_game(channel):
-    url = f"https://decapi.me/twitch/game/{channel}"
-    async with session.get(url) as resp:
-        return await resp.text()
-
-async def twitch_get_status(channel):
-    url = f"https://decapi.me/twitch/status/{channel}"
-    async with session.get(url) as resp:
-        return await resp.text()
+async def twitch_get_avatar_cached(channel):
+    # Avatars almost never change, so they are only looked up once per TWITCH_AVATAR_TTL
+    cached = twitch_avatar_cache.get(channel.lower())
+    if cached and time.monotonic() - cached[1] < TWITCH_AVATAR_TTL:
+        return cached[0]
+    avatar = await get_twitch_provider().get_avatar(channel)
+    twitch_avatar_cache[channel.lower()] = (avatar, time.monotonic())
+    return avatar
 
-async def twitch_get_viewers(channel):
-    url = f"https://decapi.me/twitch/viewercount/{channel}"
-    async with session.get(url) as resp:
-        return await resp.text()
-
-async def twitch_get_avatar(channel):
-    url = f"https://decapi.me/twitch/avatar/{channel}"
-    async with session.get(url) as resp:
-        return await resp.text()
-
-async def send_twitch_alert(channel, webhook):
+async def send_twitch_alert(channel, webhook, stream):
     try:
-        uptime = await twitch_check_uptime(channel)
-        if "offline" in uptime.lower():
-            return False
-        status = await twitch_get_status(channel)
-        game = await twitch_check_game(channel)
-        viewers = await twitch_get_viewers(channel)
-        avatar = await twitch_get_avatar(channel)
+        provider = get_twitch_provider()
+        stream, avatar = await asyncio.gather(
+            provider.get_stream_details(channel, stream),
+            twitch_get_avatar_cached(channel)
+        )
+        status = stream["title"]
+        game = stream["game"]
+        viewers = stream["viewers"]
+        uptime = stream["uptime"]
+        live_since = stream["started_at"]
         stream_url = f"https://twitch.tv/{channel}"
         thumbnail_url = f"https://static-cdn.jtvnw.net/previews-ttv/live_user_{channel}-640x360.jpg?rand={int(time.time())}"
         embed = {
@@ -380,21 +1806,34 @@ async def send_twitch_alert(channel, webhook):
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
         payload = {"embeds": [embed]}
-        async with session.post(webhook, json=payload) as resp:
-            if resp.status == 204:
-                logging.info(f" Twitch alert sent: {channel}")
-                return True
+        status = await post_webhook(webhook, payload)
+        if status == 204:
+            twitch_last_live[channel] = True
+            if live_since is not None:
+                logging.info(f" Twitch alert sent: {channel} ({time.time() - live_since:.0f}s after going live)")
             else:
-                logging.warning(f" Failed Twitch alert ({resp.status})")
+                logging.info(f" Twitch alert sent: {channel}")
+            return True
+        else:
+            logging.warning(f" Failed Twitch alert ({status})")
     except Exception as e:
         logging.error(f"[Twitch Alert ERROR] {channel}: {e}")
     return False
 
 async def main():
-    await asyncio.gather(rss_checker(), sender_worker(), twitch_checker())
+    if WORKER_COUNT > 1:
+        logging.info(f"[Shard] Worker {WORKER_INDEX + 1}/{WORKER_COUNT}")
+    if METRICS_PORT:
+        # Sharded workers listen on consecutive ports starting at METRICS_PORT
+        await start_metrics_server(METRICS_HOST, int(METRICS_PORT) + WORKER_INDEX)
+    tasks = [rss_checker(), sender_worker(), twitch_checker(), loop_lag_monitor()]
+    if WEBSUB_CALLBACK_URL:
+        tasks.append(websub_worker())
+    await asyncio.gather(*tasks)
 
 async def full_start():
-    await send_discord_notification(" RSS Bot is starting up.")
+    if WORKER_INDEX == 0:
+        await send_discord_notification(" RSS Bot is starting up.")
     await main()
 
 if __name__ == "__main__":
@@ -402,4 +1841,5 @@ if __name__ == "__main__":
         asyncio.run(full_start())
     except KeyboardInterrupt:
         print("Shutting down...")
+        save_caches(force=True)
         asyncio.run(close_session())
@@ -0,0 +1,28 @@
+import bisect
+import hashlib
+import os
+
+# start.py sets these for each checker worker; a lone rss_alerts.py owns everything
+WORKER_INDEX = int(os.getenv("RSS_WORKER_INDEX", 0))
+WORKER_COUNT = int(os.getenv("RSS_WORKER_COUNT", 1))
+RING_REPLICAS = 100  # Virtual nodes per worker, evens out each worker's share
+
+def ring_hash(value):
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+class HashRing:
+    """Consistent hash ring: adding or removing a node only moves about 1/N of the keys."""
+
+    def __init__(self, nodes, replicas=RING_REPLICAS):
+        self.ring = sorted((ring_hash(f"{node}#{replica}"), node) for node in nodes for replica in range(replicas))
+        self.hashes = [point for point, _ in self.ring]
+
+    def owner(self, key):
+        index = bisect.bisect(self.hashes, ring_hash(key)) % len(self.ring)
+        return self.ring[index][1]
+
+ring = HashRing(range(WORKER_COUNT))
+
+def owns(key):
+    """True if this worker is responsible for a feed URL, twitch: key or webhook URL."""
+    return WORKER_COUNT == 1 or ring.owner(key) == WORKER_INDEX
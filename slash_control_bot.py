@@ -1,17 +1,22 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+import aiohttp
 import json
 import os
 import re
-import requests
+import time
+from urllib.parse import quote_plus
 from discord.ui import Select, View, Button
 import asyncio
 from dotenv import load_dotenv
+from youtube_search import extract_yt_initial_data, normalize_youtube_query, parse_channel_results
 
 load_dotenv()
 
 CONFIG_FILE = "feeds_config.json"
+YOUTUBE_META_CACHE_FILE = "youtube_channels.json"
+YOUTUBE_SEARCH_TTL = 3600
 DEFAULT_CATEGORY = "General"
 BOT_TOKEN = os.getenv("DISCORD_TOKEN") or os.getenv("Discord")
 if not BOT_TOKEN:
@@ -19,80 +24,10 @@ if not BOT_TOKEN:
 
 MAX_LEN = 1900
 
-def resolve_youtube_feed_url(handle_or_url):
-    # Normalize handle input
-    if handle_or_url.startswith("@"):
-        handle = handle_or_url[1:]
-    else:
-        # Try extracting handle from full URL if possible
-        m = re.match(r"https?://www\.youtube\.com/(@[\w\d_-]+)", handle_or_url)
-        if m:
-            handle = m.group(1)[1:]
-        else:
-            # If looks like a full feed URL, just return it as-is
-            if "youtube.com/feeds/videos.xml?channel_id=" in handle_or_url:
-                return handle_or_url
-            # Otherwise fail
-            raise ValueError(" Input isn't a valid handle or feed URL")
-
-    # Query the YouTube search page filtered to channels only
-    search_url = f"https://www.youtube.com/results?search_query={handle}"  # channels only filter
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko)"
-                      " Chrome/90.0.4430.85 Safari/537.36"
-    }
-    res = requests.get(search_url, headers=headers, timeout=8)
-    if res.status_code != 200:
-        raise ValueError(f" YouTube search page request failed with status {res.status_code}")
-
-    html = res.text
-
-    # Extract ytInitialData JSON from the page
-    initial_data_match = re.search(r"ytInitialData\s*=\s*({.*?});</script>", html, re.DOTALL)
-    if not initial_data_match:
-        # Sometimes ytInitialData ends with '};' instead of '};</script>'
-        initial_data_match = re.search(r"ytInitialData\s*=\s*({.*?});", html, re.DOTALL)
-        if not initial_data_match:
-            raise ValueError(" Couldn't find ytInitialData JSON in search page")
-
-    yt_initial_data = initial_data_match.group(1)
-
-    try:
-        data = json.loads(yt_initial_data)
-    except json.JSONDecodeError as e:
-        raise ValueError(f" Failed to parse ytInitialData JSON: {e}")
-
-    # Navigate through the JSON to find the channelId of the first channel matching the handle
-    try:
-        sections = data["contents"]["twoColumnSearchResultsRenderer"]["primaryContents"]["sectionListRenderer"]["contents"]
-
-        for section in sections:
-            items = section.get("itemSectionRenderer", {}).get("contents", [])
-            for item in items:
-                channel = item.get("channelRenderer")
-                if channel:
-                    channel_id = channel.get("channelId")
-                    # Check if this channel’s customUrl or title matches the handle
-                    custom_url = channel.get("customUrl", "")
-                    title = channel.get("title", {}).get("runs", [{}])[0].get("text", "")
-
-                    if custom_url.lower() == handle.lower() or title.lower() == handle.lower():
-                        return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-
-        # If none match perfectly, fallback to first found channel
-        for section in sections:
-            items = section.get("itemSectionRenderer", {}).get("contents", [])
-            for item in items:
-                channel = item.get("channelRenderer")
-                if channel:
-                    channel_id = channel.get("channelId")
-                    return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-
-    except Exception as e:
-        raise ValueError(f" Error parsing channels: {e}")
-
-    raise ValueError(" No YouTube channel found for that handle")
-
+http_session = None
+backfill_task = None
+youtube_search_cache = {}  # normalized query -> (expires_at, channels)
+youtube_search_inflight = {}  # normalized query -> asyncio.Task
 
 class ChannelSelect(Select):
     def __init__(self, channels, on_select_callback):
@@ -114,22 +49,118 @@ class ChannelSelectView(View):
         super().__init__(timeout=60)
         self.add_item(ChannelSelect(channels, on_select_callback))
 
-def get_youtube_channel_name(channel_id):
+def load_youtube_meta_cache():
+    try:
+        with open(YOUTUBE_META_CACHE_FILE, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_youtube_meta_cache(cache):
+    tmp_file = f"{YOUTUBE_META_CACHE_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(cache, f, indent=4)
+    os.replace(tmp_file, YOUTUBE_META_CACHE_FILE)
+
+youtube_meta_cache = load_youtube_meta_cache()  # channel id -> {"name", "avatar"}
+
+async def get_http_session():
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=8))
+    return http_session
+
+async def fetch_youtube_channel_meta(channel_id):
+    """Channel name and avatar from the channel page, cached on disk; None if the page can't be read."""
+    if channel_id in youtube_meta_cache:
+        return youtube_meta_cache[channel_id]
     url = f"https://www.youtube.com/channel/{channel_id}"
     try:
-        res = requests.get(url, timeout=6)
-        # Extract channel name from <title> tag
-        match = re.search(r'<title>(.*?) - YouTube</title>', res.text)
-        if match:
-            return match.group(1)
-        return "YouTube Channel"
-    except Exception:
-        return "YouTube Channel"
+        session = await get_http_session()
+        async with session.get(url) as res:
+            html = await res.text()
+    except Exception as e:
+        print(f"[YouTube] Failed to fetch channel page for {channel_id}: {type(e).__name__} - {e}")
+        return None
+    # Extract channel name from <title> tag
+    match = re.search(r'<title>(.*?) - YouTube</title>', html)
+    if not match:
+        return None
+    avatar = re.search(r'<meta property="og:image" content="([^"]+)"', html)
+    meta = {"name": match.group(1), "avatar": avatar.group(1) if avatar else None}
+    youtube_meta_cache[channel_id] = meta
+    save_youtube_meta_cache(youtube_meta_cache)
+    return meta
+
+async def backfill_youtube_metadata():
+    config = load_config()
+    missing = {
+        url: re.search(r"channel_id=([^&]+)", url).group(1)
+        for url, entry in config.items()
+        if "youtube.com/feeds/videos.xml?channel_id=" in url and not entry.get("channel_name")
+    }
+    if not missing:
+        return
+    found = {}
+    for url, channel_id in missing.items():
+        meta = await fetch_youtube_channel_meta(channel_id)
+        if meta:
+            found[url] = meta
+    # Re-read so feeds changed while we were fetching aren't overwritten
+    config = load_config()
+    for url, meta in found.items():
+        if url in config and not config[url].get("channel_name"):
+            config[url]["channel_name"] = meta["name"]
+            if meta.get("avatar"):
+                config[url]["channel_avatar"] = meta["avatar"]
+    if found:
+        save_config(config)
+        print(f"[+] Backfilled YouTube metadata for {len(found)} feeds.")
+
+def schedule_youtube_backfill():
+    global backfill_task
+    if backfill_task is None or backfill_task.done():
+        backfill_task = asyncio.create_task(backfill_youtube_metadata())
 
 intents = discord.Intents.default()
 intents.guilds = True
+intents.webhooks = True  # on_webhooks_update keeps the webhook cache fresh
 bot = commands.Bot(command_prefix="!", intents=intents)
 
+# Bot-owned webhooks per channel, filled on first use and dropped on on_webhooks_update
+webhook_cache = {}  # channel id -> list of discord.Webhook
+webhook_channels = {}  # webhook URL -> channel id
+config_index = {"version": None, "config": {}, "feeds": {}}  # feeds: webhook URL -> (config position, key) pairs
+
+async def get_channel_webhooks(channel):
+    if channel.id not in webhook_cache:
+        webhooks = await channel.webhooks()
+        owned = [wh for wh in webhooks if wh.user == channel.guild.me]
+        webhook_cache[channel.id] = owned
+        for wh in owned:
+            webhook_channels[wh.url] = channel.id
+    return webhook_cache[channel.id]
+
+async def get_or_create_webhook(channel):
+    owned = await get_channel_webhooks(channel)
+    if owned:
+        return owned[0]
+    wh = await channel.create_webhook(name="RSSBot")
+    owned.append(wh)
+    webhook_channels[wh.url] = channel.id
+    return wh
+
+async def channel_webhook_urls(channel):
+    return {wh.url for wh in await get_channel_webhooks(channel)}
+
+def webhook_in_channel(webhook_url, channel):
+    # Only valid after get_channel_webhooks(channel) has filled the cache
+    return webhook_channels.get(webhook_url) == channel.id
+
+def invalidate_webhooks(channel_id):
+    for wh in webhook_cache.pop(channel_id, []):
+        webhook_channels.pop(wh.url, None)
+
 def load_config():
     if os.path.exists(CONFIG_FILE):
         with open(CONFIG_FILE, "r") as f:
@@ -137,8 +168,72 @@ def load_config():
     return {}
 
 def save_config(config):
-    with open(CONFIG_FILE, "w") as f:
+    # Write to a temp file and rename it over the config so readers never see a partial file
+    tmp_file = f"{CONFIG_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
         json.dump(config, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, CONFIG_FILE)
+
+def feed_subscriptions(entry):
+    # Feeds added before fan-out have a single top-level webhook and category
+    if "subscriptions" in entry:
+        return entry["subscriptions"]
+    return [{"webhook": entry["webhook"], "category": entry.get("category", "RSS")}]
+
+def get_config_index():
+    """Read-only config and its webhook URL -> feed keys index, rebuilt only when feeds_config.json changes."""
+    try:
+        st = os.stat(CONFIG_FILE)
+        version = (st.st_ino, st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        version = None
+    if version != config_index["version"]:
+        config = load_config() if version else {}
+        feeds = {}
+        for position, (key, entry) in enumerate(config.items()):
+            for sub in feed_subscriptions(entry):
+                feeds.setdefault(sub["webhook"], []).append((position, key))
+        config_index.update(version=version, config=config, feeds=feeds)
+    return config_index["config"], config_index["feeds"]
+
+async def channel_feeds(channel):
+    """Config keys delivering to a channel's webhooks, in config order, found without scanning the config."""
+    config, feeds = get_config_index()
+    found = {item for wh in await get_channel_webhooks(channel) for item in feeds.get(wh.url, ())}
+    return config, [key for _, key in sorted(found)]
+
+def add_subscription(config, url, webhook_url, category, channel_whs, **fields):
+    """Subscribe a channel's webhook to a feed, replacing that channel's old subscription and keeping the others."""
+    entry = dict(config.get(url, {}))
+    subscriptions = [sub for sub in feed_subscriptions(entry) if sub["webhook"] not in channel_whs] if entry else []
+    subscriptions.append({"webhook": webhook_url, "category": category})
+    entry.pop("webhook", None)
+    entry.pop("category", None)
+    entry.update(fields)
+    entry["subscriptions"] = subscriptions
+    config[url] = entry
+
+def remove_subscription(config, url, channel_whs):
+    """Drop a channel's subscription to a feed, and the feed once nobody subscribes to it; False if there was none."""
+    if url not in config:
+        return False
+    subscriptions = feed_subscriptions(config[url])
+    remaining = [sub for sub in subscriptions if sub["webhook"] not in channel_whs]
+    if len(remaining) == len(subscriptions):
+        return False
+    if remaining:
+        entry = {k: v for k, v in config[url].items() if k not in ("webhook", "category")}
+        entry["subscriptions"] = remaining
+        config[url] = entry
+    else:
+        del config[url]
+    return True
+
+@bot.event
+async def on_webhooks_update(channel):
+    invalidate_webhooks(channel.id)
 
 @bot.event
 async def on_ready():
@@ -150,6 +245,8 @@ async def on_ready():
     except Exception as e:
         print(f"[ERROR] Sync failed: {e}")
 
+    schedule_youtube_backfill()
+
 async def send_long_message(interaction, content):
     lines = content.split('\n')
     chunk = ""
@@ -183,31 +280,39 @@ class ConfirmAddView(View):
 async def rss_list(interaction: discord.Interaction):
     if not interaction.response.is_done():
         await interaction.response.defer(ephemeral=True)
-    config = load_config()
+    config, urls = await channel_feeds(interaction.channel)
     feed_count = 0
 
-    webhooks = await interaction.channel.webhooks()
-    channel_whs = [wh.url for wh in webhooks if wh.user == interaction.guild.me]
+    channel_whs = await channel_webhook_urls(interaction.channel)
 
     msg = ""
-    for url, entry in config.items():
-        if entry["webhook"] in channel_whs:
+    missing_names = False
+    for url in urls:
+        entry = config[url]
+        for sub in feed_subscriptions(entry):
+            if sub["webhook"] not in channel_whs:
+                continue
             if "youtube.com/feeds/videos.xml?channel_id=" in url:
-                channel_id = re.search(r"channel_id=([^&]+)", url).group(1)
-                channel_name = get_youtube_channel_name(channel_id)
-                msg += f"• **{entry.get('category', 'Unknown')}** → {channel_name} ({url})\n"
+                channel_name = entry.get("channel_name")
+                if not channel_name:
+                    missing_names = True
+                    channel_name = "YouTube Channel"
+                msg += f"• **{sub.get('category', 'Unknown')}** → {channel_name} ({url})\n"
             else:
-                msg += f"• **{entry.get('category', 'Unknown')}** → {url}\n"
+                msg += f"• **{sub.get('category', 'Unknown')}** → {url}\n"
             feed_count += 1
+            break
+
+    if missing_names:
+        schedule_youtube_backfill()
 
     if feed_count == 0:
         await interaction.followup.send(" No feeds configured in this channel.")
     else:
         await send_long_message(interaction, f"📡 **Feeds in {interaction.channel.mention}:**\n{msg}")
 
-async def search_youtube_channels_no_browser_async(query, max_results=5):
-    query = query.replace(' ', '+')
-    url = f"https://www.youtube.com/results?search_query={query}&sp=EgIQAg%3D%3D"  # filter to channels only
+async def fetch_youtube_channels(query):
+    url = f"https://www.youtube.com/results?search_query={quote_plus(query)}&sp=EgIQAg%3D%3D"  # filter to channels only
 
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
@@ -215,82 +320,59 @@ async def search_youtube_channels_no_browser_async(query, max_results=5):
                       'Chrome/113.0.0.0 Safari/537.36',
     }
 
-    # Run blocking request in executor for async compatibility
-    loop = asyncio.get_running_loop()
-    def fetch():
-        import requests
-        return requests.get(url, headers=headers, timeout=8).text
-
     try:
-        html = await loop.run_in_executor(None, fetch)
-    except Exception as e:
-        raise ValueError(f" YouTube request error: {e}")
+        session = await get_http_session()
+        async with session.get(url, headers=headers) as res:
+            if res.status != 200:
+                raise ValueError(f" YouTube search page request failed with status {res.status}")
+            html = await res.text()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise ValueError(f" YouTube request error: {type(e).__name__} {e}")
 
-    try:
-        import json, re
-        initial_data_match = re.search(r'var ytInitialData = ({.*?});</script>', html, re.DOTALL)
-        if not initial_data_match:
-            initial_data_match = re.search(r'window\["ytInitialData"\] = ({.*?});', html, re.DOTALL)
-        if not initial_data_match:
-            raise ValueError(" Could not find ytInitialData JSON on page")
-
-        initial_data = initial_data_match.group(1)
-        data = json.loads(initial_data)
-    except Exception as e:
-        raise ValueError(f" Failed to extract initial data: {e}")
-
-    channels = []
+    return parse_channel_results(extract_yt_initial_data(html))
 
+async def fetch_and_cache_youtube_channels(key):
     try:
-        sections = data.get('contents', {}) \
-                       .get('twoColumnSearchResultsRenderer', {}) \
-                       .get('primaryContents', {}) \
-                       .get('sectionListRenderer', {}) \
-                       .get('contents', [])
-
-        for section in sections:
-            item_section = section.get('itemSectionRenderer', {})
-            items = item_section.get('contents', [])
-            for item in items:
-                channel = item.get('channelRenderer')
-                if channel:
-                    name = None
-                    title_obj = channel.get('title')
-                    if title_obj:
-                        runs = title_obj.get('runs')
-                        if runs and len(runs) > 0:
-                            name = runs[0].get('text')
-                        else:
-                            name = title_obj.get('simpleText')
-                    if not name:
-                        continue
-
-                    channel_id = channel.get('channelId')
-
-                    url = None
-                    if 'navigationEndpoint' in channel and 'browseEndpoint' in channel['navigationEndpoint']:
-                        browse = channel['navigationEndpoint']['browseEndpoint']
-                        if 'canonicalBaseUrl' in browse:
-                            url = "https://www.youtube.com" + browse['canonicalBaseUrl']
-                        elif 'browseId' in browse:
-                            url = "https://www.youtube.com/channel/" + browse['browseId']
-                    if not url and channel_id:
-                        url = f"https://www.youtube.com/channel/{channel_id}"
-
-                    desc_runs = channel.get('descriptionSnippet', {}).get('runs', [])
-                    description = ''.join([run.get('text', '') for run in desc_runs]) if desc_runs else "No description available."
-
-                    channels.append((name, url, channel_id, description))
-
-                    if len(channels) >= max_results:
-                        break
-            if len(channels) >= max_results:
-                break
+        channels = await fetch_youtube_channels(key)
+        now = time.monotonic()
+        for expired in [k for k, (expires_at, _) in youtube_search_cache.items() if expires_at <= now]:
+            del youtube_search_cache[expired]
+        youtube_search_cache[key] = (now + YOUTUBE_SEARCH_TTL, channels)
+        return channels
+    finally:
+        youtube_search_inflight.pop(key, None)
 
-    except Exception as e:
-        raise ValueError(f" Failed parsing channels JSON: {e}")
-
-    return channels
+async def search_youtube_channels_no_browser_async(query, max_results=5):
+    key = normalize_youtube_query(query)
+    cached = youtube_search_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1][:max_results]
+
+    # Concurrent lookups for the same creator share one request
+    task = youtube_search_inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(fetch_and_cache_youtube_channels(key))
+        youtube_search_inflight[key] = task
+    channels = await asyncio.shield(task)
+    return channels[:max_results]
+
+async def resolve_youtube_feed_url(handle_or_url):
+    # If looks like a full feed URL, just return it as-is
+    if "youtube.com/feeds/videos.xml?channel_id=" in handle_or_url:
+        return handle_or_url
+    if not (handle_or_url.startswith("@") or re.match(r"https?://www\.youtube\.com/@[\w.-]+", handle_or_url)):
+        raise ValueError(" Input isn't a valid handle or feed URL")
+
+    handle = normalize_youtube_query(handle_or_url)
+    channels = await search_youtube_channels_no_browser_async(handle, max_results=None)
+    if not channels:
+        raise ValueError(" No YouTube channel found for that handle")
+
+    # Prefer the channel whose handle or title matches, else the first result
+    for name, url, channel_id, desc, avatar in channels:
+        if url.lower().endswith(f"/@{handle}") or name.lower() == handle:
+            return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+    return f"https://www.youtube.com/feeds/videos.xml?channel_id={channels[0][2]}"
 
 @bot.tree.command(name="rss_add", description="Add an RSS or YouTube feed to this channel")
 @app_commands.describe(url="The RSS feed URL or YouTube handle to monitor")
@@ -309,26 +391,30 @@ async def rss_add(interaction: discord.Interaction, url: str):
                 await interaction.followup.send(" No YouTube channels found with that handle or name.")
                 return
 
+            # Channel name and avatar come from the search results, so nothing is fetched on select
+            channel_meta = {}
+            for name, url_, channel_id, desc, avatar in channels:
+                channel_meta[f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"] = (name, avatar)
+
             async def on_channel_selected(inter, selected_url):
-                channel_id = re.search(r"channel_id=([^&]+)", selected_url).group(1)
-                channel_name = get_youtube_channel_name(channel_id)
+                channel_name, channel_avatar = channel_meta[selected_url]
 
-                webhooks = await inter.channel.webhooks()
-                wh = next((w for w in webhooks if w.user == inter.guild.me), None)
-                if not wh:
-                    wh = await inter.channel.create_webhook(name="RSSBot")
+                wh = await get_or_create_webhook(inter.channel)
+                channel_whs = await channel_webhook_urls(inter.channel)
 
-                config[selected_url] = {
-                    "category": "YouTube",
-                    "webhook": wh.url
-                }
-                save_config(config)
+                # The selection can take a while; re-read so we don't drop feeds added meanwhile
+                current_config = load_config()
+                fields = {"channel_name": channel_name}
+                if channel_avatar:
+                    fields["channel_avatar"] = channel_avatar
+                add_subscription(current_config, selected_url, wh.url, "YouTube", channel_whs, **fields)
+                save_config(current_config)
 
                 await inter.response.edit_message(content=f" Added YouTube feed: **{channel_name}**\n→ `{selected_url}`", view=None, embed=None)
 
             # Build ChannelSelectView options from new data:
             options = []
-            for name, url_, channel_id, desc in channels:
+            for name, url_, channel_id, desc, avatar in channels:
                 feed_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
                 options.append((name, feed_url))
 
@@ -340,15 +426,10 @@ async def rss_add(interaction: discord.Interaction, url: str):
         return
 
     # Existing RSS handling code remains...
-    webhooks = await interaction.channel.webhooks()
-    wh = next((w for w in webhooks if w.user == interaction.guild.me), None)
-    if not wh:
-        wh = await interaction.channel.create_webhook(name="RSSBot")
-
-    config[url] = {
-        "category": "RSS",
-        "webhook": wh.url
-    }
+    wh = await get_or_create_webhook(interaction.channel)
+
+    # Other channels subscribed to the same feed keep their subscriptions; it is still fetched once
+    add_subscription(config, url, wh.url, "RSS", await channel_webhook_urls(interaction.channel))
     save_config(config)
     await interaction.followup.send(f" Added RSS feed:\n→ `{url}`")
 
@@ -360,11 +441,9 @@ async def rss_remove(interaction: discord.Interaction, url: str):
     if not interaction.response.is_done():
         await interaction.response.defer(ephemeral=True)
     config = load_config()
-    webhooks = await interaction.channel.webhooks()
-    channel_whs = [wh.url for wh in webhooks if wh.user == interaction.guild.me]
+    channel_whs = await channel_webhook_urls(interaction.channel)
 
-    if url in config and config[url]["webhook"] in channel_whs:
-        del config[url]
+    if remove_subscription(config, url, channel_whs):
         save_config(config)
         await interaction.followup.send(f" Removed feed:\n• `{url}` from {interaction.channel.mention}")
     else:
@@ -378,10 +457,7 @@ async def twitch_add(interaction: discord.Interaction, channel: str):
     config = load_config()
 
     try:
-        webhooks = await interaction.channel.webhooks()
-        wh = next((w for w in webhooks if w.user == interaction.guild.me), None)
-        if not wh:
-            wh = await interaction.channel.create_webhook(name="RSSBot")
+        wh = await get_or_create_webhook(interaction.channel)
 
         key = f"twitch:{channel}"
         config[key] = {
@@ -407,14 +483,12 @@ async def twitch_add(interaction: discord.Interaction, channel: str):
 
 @bot.tree.command(name="twitch_list", description="List Twitch feeds in this channel")
 async def twitch_list(interaction: discord.Interaction):
-    config = load_config()
-    webhooks = await interaction.channel.webhooks()
-    channel_whs = [wh.url for wh in webhooks if wh.user == interaction.guild.me]
+    _, keys = await channel_feeds(interaction.channel)
 
     msg = ""
     count = 0
-    for key, entry in config.items():
-        if key.startswith("twitch:") and entry["webhook"] in channel_whs:
+    for key in keys:
+        if key.startswith("twitch:"):
             msg += f"• `{key}`\n"
             count += 1
 
@@ -428,10 +502,9 @@ async def twitch_list(interaction: discord.Interaction):
 async def twitch_remove(interaction: discord.Interaction, channel: str):
     config = load_config()
     key = f"twitch:{channel}"
-    webhooks = await interaction.channel.webhooks()
-    channel_whs = [wh.url for wh in webhooks if wh.user == interaction.guild.me]
+    await get_channel_webhooks(interaction.channel)
 
-    if key in config and config[key]["webhook"] in channel_whs:
+    if key in config and webhook_in_channel(config[key]["webhook"], interaction.channel):
         del config[key]
         save_config(config)
         await interaction.response.send_message(f" Removed Twitch feed: `{key}`", ephemeral=True)
@@ -6,36 +6,59 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+RSS_WORKERS = int(os.getenv("RSS_WORKERS", 1))
+RESTART_DELAY = 1  # Seconds before restarting a dead service, doubled while it keeps crashing
+MAX_RESTART_DELAY = 60
+STABLE_RUNTIME = 60  # A service that ran this long is considered healthy again
+
+def start_service(service):
+    service["process"] = subprocess.Popen(service["args"], env=service["env"])
+    service["started_at"] = time.monotonic()
+
 def main():
     print("Starting RssTool2.0 services...")
 
-    processes = []
+    services = []
+    for index in range(RSS_WORKERS):
+        env = dict(os.environ, RSS_WORKER_INDEX=str(index), RSS_WORKER_COUNT=str(RSS_WORKERS))
+        name = f"RSS Alerts worker {index + 1}/{RSS_WORKERS}" if RSS_WORKERS > 1 else "RSS Alerts"
+        services.append({"name": name, "args": [sys.executable, "rss_alerts.py"], "env": env})
+    services.append({"name": "Slash Control Bot", "args": [sys.executable, "slash_control_bot.py"], "env": None})
 
     try:
-        # Start RSS Alerts
-        print("[+] Starting RSS Alerts...")
-        p1 = subprocess.Popen([sys.executable, "rss_alerts.py"])
-        processes.append(p1)
-
-        # Start Slash Control Bot
-        print("[+] Starting Slash Control Bot...")
-        p2 = subprocess.Popen([sys.executable, "slash_control_bot.py"])
-        processes.append(p2)
+        for service in services:
+            print(f"[+] Starting {service['name']}...")
+            start_service(service)
+            service["delay"] = RESTART_DELAY
+            service["restart_at"] = None
 
         print("All services started. Press Ctrl+C to stop.")
-        
+
         while True:
             time.sleep(1)
-            # Check if any process has died
-            for p in processes:
-                if p.poll() is not None:
-                    print(f"Process {p.args} died. Exiting...")
-                    raise KeyboardInterrupt
+            now = time.monotonic()
+            # Restart dead services one at a time; the others keep running
+            for service in services:
+                if service["restart_at"] is not None:
+                    if now >= service["restart_at"]:
+                        print(f"[+] Restarting {service['name']}...")
+                        start_service(service)
+                        service["restart_at"] = None
+                    continue
+                code = service["process"].poll()
+                if code is None:
+                    continue
+                if now - service["started_at"] >= STABLE_RUNTIME:
+                    service["delay"] = RESTART_DELAY
+                print(f"{service['name']} exited with code {code}. Restarting in {service['delay']}s...")
+                service["restart_at"] = now + service["delay"]
+                service["delay"] = min(service["delay"] * 2, MAX_RESTART_DELAY)
 
     except KeyboardInterrupt:
         print("\nStopping services...")
-        for p in processes:
-            p.terminate()
+        for service in services:
+            if service["restart_at"] is None:
+                service["process"].terminate()
         print("Services stopped.")
 
 if __name__ == "__main__":
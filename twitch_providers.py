@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TWITCH_CLIENT_ID = os.getenv("TWITCH_CLIENT_ID")
+TWITCH_CLIENT_SECRET = os.getenv("TWITCH_CLIENT_SECRET")
+TWITCH_HELIX_URL = os.getenv("TWITCH_HELIX_URL", "https://api.twitch.tv/helix")
+TWITCH_AUTH_URL = os.getenv("TWITCH_AUTH_URL", "https://id.twitch.tv/oauth2/token")
+DECAPI_URL = os.getenv("DECAPI_URL", "https://decapi.me/twitch")
+HELIX_MAX_LOGINS = 100  # Helix accepts up to 100 user_login parameters per request
+
+# Every provider returns stream info as a dict:
+#   {"title": str, "game": str, "viewers": str, "started_at": epoch seconds or None, "uptime": str}
+# get_streams() maps lowercased channel -> stream dict when live, None when offline,
+# and leaves out channels that don't exist or couldn't be checked.
+
+def parse_twitch_uptime(uptime):
+    """Seconds live from a decapi uptime string such as '1 hour, 5 minutes, 3 seconds', or None."""
+    units = {"day": 86400, "hour": 3600, "minute": 60, "second": 1}
+    matches = re.findall(r"(\d+)\s+(day|hour|minute|second)s?", uptime)
+    if not matches:
+        return None
+    return sum(int(value) * units[unit] for value, unit in matches)
+
+def format_uptime(seconds):
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, secs = divmod(remainder, 60)
+    parts = []
+    if hours:
+        parts.append(f"{hours} hour{'s' if hours != 1 else ''}")
+    if minutes:
+        parts.append(f"{minutes} minute{'s' if minutes != 1 else ''}")
+    if secs or not parts:
+        parts.append(f"{secs} second{'s' if secs != 1 else ''}")
+    return ", ".join(parts)
+
+class TwitchProvider:
+    """Live-status backend interface used by twitch_checker."""
+
+    name = "base"
+
+    async def get_streams(self, channels):
+        raise NotImplementedError
+
+    async def get_stream_details(self, channel, stream):
+        """Fill in any stream fields get_streams left empty."""
+        return stream
+
+    async def get_avatar(self, channel):
+        raise NotImplementedError
+
+class DecapiProvider(TwitchProvider):
+    """One decapi.me request per channel and per field."""
+
+    name = "decapi"
+
+    def __init__(self, session, base_url=DECAPI_URL, max_concurrent=10):
+        self.session = session
+        self.base_url = base_url.rstrip("/")
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def fetch(self, endpoint, channel):
+        async with self.session.get(f"{self.base_url}/{endpoint}/{channel}") as resp:
+            return await resp.text()
+
+    async def check_channel(self, channel):
+        try:
+            async with self.semaphore:
+                uptime = await self.fetch("uptime", channel)
+        except Exception as e:
+            logging.error(f"[Twitch Check ERROR] {channel}: {e}")
+            return channel, False
+        if "not found" in uptime.lower():
+            logging.warning(f"[Twitch] Channel not found: {channel}")
+            return channel, False
+        if "offline" in uptime.lower():
+            return channel, None
+        live_seconds = parse_twitch_uptime(uptime)
+        return channel, {
+            "title": None,
+            "game": None,
+            "viewers": None,
+            "started_at": time.time() - live_seconds if live_seconds is not None else None,
+            "uptime": uptime
+        }
+
+    async def get_streams(self, channels):
+        results = await asyncio.gather(*(self.check_channel(channel) for channel in channels))
+        return {channel.lower(): stream for channel, stream in results if stream is not False}
+
+    async def get_stream_details(self, channel, stream):
+        title, game, viewers = await asyncio.gather(
+            self.fetch("status", channel),
+            self.fetch("game", channel),
+            self.fetch("viewercount", channel)
+        )
+        return dict(stream, title=title, game=game, viewers=viewers)
+
+    async def get_avatar(self, channel):
+        return await self.fetch("avatar", channel)
+
+class HelixProvider(TwitchProvider):
+    """Twitch Helix API: one streams request per 100 channels, with a fallback provider on errors."""
+
+    name = "helix"
+
+    def __init__(self, session, client_id, client_secret, fallback=None,
+                 base_url=TWITCH_HELIX_URL, auth_url=TWITCH_AUTH_URL):
+        self.session = session
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.fallback = fallback
+        self.base_url = base_url.rstrip("/")
+        self.auth_url = auth_url
+        self.token = None
+        self.token_expires = 0.0
+
+    async def get_token(self, refresh=False):
+        if self.token and not refresh and time.monotonic() < self.token_expires:
+            return self.token
+        params = {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "grant_type": "client_credentials"
+        }
+        async with self.session.post(self.auth_url, params=params) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+        self.token = data["access_token"]
+        # Refresh a minute early so a request never goes out with an expired token
+        self.token_expires = time.monotonic() + data.get("expires_in", 3600) - 60
+        return self.token
+
+    async def helix_get(self, endpoint, params):
+        for refresh in (False, True):
+            headers = {
+                "Client-ID": self.client_id,
+                "Authorization": f"Bearer {await self.get_token(refresh)}"
+            }
+            async with self.session.get(f"{self.base_url}/{endpoint}", params=params, headers=headers) as resp:
+                if resp.status == 401 and not refresh:
+                    continue
+                resp.raise_for_status()
+                return (await resp.json())["data"]
+
+    async def get_streams(self, channels):
+        try:
+            streams = {channel.lower(): None for channel in channels}
+            for start in range(0, len(channels), HELIX_MAX_LOGINS):
+                batch = channels[start:start + HELIX_MAX_LOGINS]
+                params = [("user_login", channel) for channel in batch] + [("first", str(HELIX_MAX_LOGINS))]
+                for item in await self.helix_get("streams", params):
+                    started_at = datetime.fromisoformat(item["started_at"].replace("Z", "+00:00")).timestamp()
+                    streams[item["user_login"].lower()] = {
+                        "title": item.get("title"),
+                        "game": item.get("game_name"),
+                        "viewers": str(item.get("viewer_count", 0)),
+                        "started_at": started_at,
+                        "uptime": format_uptime(time.time() - started_at)
+                    }
+            return streams
+        except Exception as e:
+            if not self.fallback:
+                raise
+            logging.warning(f"[Twitch] Helix streams request failed, falling back to {self.fallback.name}: "
+                            f"{type(e).__name__} - {e}")
+            return await self.fallback.get_streams(channels)
+
+    async def get_stream_details(self, channel, stream):
+        if stream.get("title") is None and self.fallback:
+            return await self.fallback.get_stream_details(channel, stream)
+        return stream
+
+    async def get_avatar(self, channel):
+        try:
+            users = await self.helix_get("users", [("login", channel)])
+            return users[0]["profile_image_url"] if users else None
+        except Exception as e:
+            if not self.fallback:
+                raise
+            logging.warning(f"[Twitch] Helix users request failed for {channel}: {type(e).__name__} - {e}")
+            return await self.fallback.get_avatar(channel)
+
+def create_provider(session, max_concurrent=10):
+    """Helix when TWITCH_CLIENT_ID / TWITCH_CLIENT_SECRET are set (decapi as fallback), else decapi."""
+    decapi = DecapiProvider(session, max_concurrent=max_concurrent)
+    if TWITCH_CLIENT_ID and TWITCH_CLIENT_SECRET:
+        return HelixProvider(session, TWITCH_CLIENT_ID, TWITCH_CLIENT_SECRET, fallback=decapi)
+    return decapi
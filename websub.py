@@ -0,0 +1,214 @@
+import asyncio
+import hmac
+import json
+import logging
+import os
+import re
+import secrets
+import time
+from urllib.parse import urljoin, urlparse, parse_qs
+from aiohttp import web
+from dotenv import load_dotenv
+from sharding import WORKER_COUNT, WORKER_INDEX
+
+load_dotenv()
+
+WEBSUB_CALLBACK_URL = os.getenv("WEBSUB_CALLBACK_URL")  # Public base URL of the callback server; WebSub is off when unset
+WEBSUB_HOST = os.getenv("WEBSUB_HOST", "0.0.0.0")
+WEBSUB_PORT = int(os.getenv("WEBSUB_PORT", 8090))
+WEBSUB_LEASE_SECONDS = int(os.getenv("WEBSUB_LEASE_SECONDS", 864000))  # 10 days
+WEBSUB_STATE_FILE = f'websub_subscriptions.{WORKER_INDEX}.json' if WORKER_COUNT > 1 else 'websub_subscriptions.json'
+WEBSUB_VERIFY_TIMEOUT = 3600  # Ask again when a hub never verified a request
+WEBSUB_RENEW_MARGIN = 86400  # Renew a lease this long before it runs out
+DISCOVERY_BYTES = 16 * 1024  # Hub links sit in the feed header
+YOUTUBE_HUB = "https://pubsubhubbub.appspot.com/"
+YOUTUBE_TOPIC = "https://www.youtube.com/xml/feeds/videos.xml?channel_id="
+
+LINK_TAG_RE = re.compile(r"<(?:atom:)?link\b[^>]*>", re.IGNORECASE)
+LINK_HEADER_RE = re.compile(r'<([^>]+)>\s*;[^,]*?\brel\s*=\s*"?([^",;]+)"?', re.IGNORECASE)
+
+def tag_attr(tag, name):
+    match = re.search(rf'\b{name}\s*=\s*["\']([^"\']*)["\']', tag, re.IGNORECASE)
+    return match.group(1) if match else None
+
+def discover_hub(feed_url, body, link_header=None):
+    """(hub URL, topic URL) a feed advertises in its Link header or <link rel="hub">, or None."""
+    links = {}
+    if link_header:
+        for href, rels in LINK_HEADER_RE.findall(link_header):
+            for rel in rels.split():
+                links.setdefault(rel.lower(), href)
+    for tag in LINK_TAG_RE.findall(body[:DISCOVERY_BYTES]):
+        rel, href = tag_attr(tag, "rel"), tag_attr(tag, "href")
+        if rel and href:
+            links.setdefault(rel.lower(), href)
+    if "hub" in links:
+        return urljoin(feed_url, links["hub"]), urljoin(feed_url, links.get("self", feed_url))
+    return youtube_hub(feed_url)
+
+def youtube_hub(feed_url):
+    # YouTube channel feeds don't advertise their hub, but all of them use Google's
+    parsed = urlparse(feed_url)
+    if parsed.netloc.endswith("youtube.com") and parsed.path == "/feeds/videos.xml":
+        channel_id = parse_qs(parsed.query).get("channel_id")
+        if channel_id:
+            return YOUTUBE_HUB, YOUTUBE_TOPIC + channel_id[0]
+    return None
+
+class WebSubManager:
+    """Subscribes hub-advertised feeds, answers hub verification and hands signed pushes to on_content.
+
+    Each subscription gets its own callback id and HMAC secret, persisted in
+    WEBSUB_STATE_FILE so leases survive restarts. Pushes are acknowledged before
+    on_content runs, in a background task.
+    """
+
+    def __init__(self, session, on_content, callback_base=WEBSUB_CALLBACK_URL, state_file=WEBSUB_STATE_FILE):
+        self.session = session
+        self.on_content = on_content
+        self.callback_base = callback_base.rstrip("/")
+        self.state_file = state_file
+        self.subscriptions = self.load()  # feed URL -> subscription dict
+        self.hubs = {}  # feed URL -> (hub, topic) discovered this run
+        self.unsubscribing = {}  # callback id -> topic, until the hub verifies the unsubscribe
+        self.push_tasks = set()  # Pushes being processed; the loop only keeps weak references to tasks
+
+    def load(self):
+        try:
+            with open(self.state_file, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        tmp_file = self.state_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.subscriptions, f)
+        os.replace(tmp_file, self.state_file)
+
+    def callback_url(self, callback_id):
+        # The worker index lets a reverse proxy route each sharded worker's callbacks to its port
+        return f"{self.callback_base}/{WORKER_INDEX}/{callback_id}"
+
+    def find_subscription(self, callback_id):
+        for feed_url, sub in self.subscriptions.items():
+            if sub["callback_id"] == callback_id:
+                return feed_url, sub
+        return None, None
+
+    def is_active(self, feed_url):
+        sub = self.subscriptions.get(feed_url)
+        return bool(sub) and sub["lease_expires"] > time.time()
+
+    def needs_body(self, feed_url):
+        """True until a full body of the feed was checked for a hub, so its poller skips the 304 shortcut once."""
+        return feed_url not in self.hubs and youtube_hub(feed_url) is None
+
+    def note_feed(self, feed_url, body, link_header=None):
+        """Look for a hub in a freshly fetched feed; cheap after the first fetch."""
+        if feed_url in self.hubs:
+            return
+        self.hubs[feed_url] = discover_hub(feed_url, body, link_header)
+
+    async def request(self, mode, hub, topic, callback_id, secret=None):
+        data = {"hub.mode": mode, "hub.topic": topic, "hub.callback": self.callback_url(callback_id)}
+        if mode == "subscribe":
+            data["hub.lease_seconds"] = str(WEBSUB_LEASE_SECONDS)
+            data["hub.secret"] = secret
+        try:
+            async with self.session.post(hub, data=data, timeout=10) as resp:
+                if resp.status not in (202, 204):
+                    logging.warning(f"[WebSub] {mode} for {topic} rejected by {hub} ({resp.status})")
+                    return False
+        except Exception as e:
+            logging.error(f"[WebSub] {mode} request to {hub} failed: {type(e).__name__} - {e}")
+            return False
+        return True
+
+    async def sync(self, feed_urls):
+        """Subscribe, renew and unsubscribe so subscriptions match the configured feeds."""
+        now = time.time()
+        changed = False
+        for feed_url in feed_urls:
+            # YouTube topics follow from the URL alone, so they don't wait for a changed body
+            found = self.hubs.get(feed_url) or youtube_hub(feed_url)
+            sub = self.subscriptions.get(feed_url)
+            if found and (sub is None or (sub["hub"], sub["topic"]) != found):
+                sub = {"hub": found[0], "topic": found[1], "callback_id": secrets.token_hex(16),
+                       "secret": secrets.token_hex(32), "requested_at": 0, "verified_at": 0, "lease_expires": 0}
+                self.subscriptions[feed_url] = sub
+                changed = True
+            if sub is None:
+                continue
+            if sub["lease_expires"] > now + WEBSUB_RENEW_MARGIN:
+                continue
+            if sub["verified_at"] < sub["requested_at"] > now - WEBSUB_VERIFY_TIMEOUT:
+                continue  # Waiting for the hub to verify
+            if await self.request("subscribe", sub["hub"], sub["topic"], sub["callback_id"], sub["secret"]):
+                sub["requested_at"] = now
+                changed = True
+        for feed_url in set(self.subscriptions) - set(feed_urls):
+            sub = self.subscriptions.pop(feed_url)
+            self.unsubscribing[sub["callback_id"]] = sub["topic"]
+            await self.request("unsubscribe", sub["hub"], sub["topic"], sub["callback_id"])
+            changed = True
+        if changed:
+            self.save()
+
+    async def handle_verify(self, request):
+        callback_id = request.match_info["callback_id"]
+        mode = request.query.get("hub.mode")
+        topic = request.query.get("hub.topic")
+        challenge = request.query.get("hub.challenge", "")
+        if mode == "unsubscribe" and self.unsubscribing.get(callback_id) == topic:
+            del self.unsubscribing[callback_id]
+            return web.Response(text=challenge)
+        feed_url, sub = self.find_subscription(callback_id)
+        if sub is None or sub["topic"] != topic:
+            return web.Response(status=404)
+        if mode == "denied":
+            logging.warning(f"[WebSub] {sub['hub']} denied the subscription to {topic}: "
+                            f"{request.query.get('hub.reason', 'no reason given')}")
+            return web.Response(text="")
+        if mode != "subscribe":
+            return web.Response(status=404)
+        lease = int(request.query.get("hub.lease_seconds", WEBSUB_LEASE_SECONDS))
+        sub["verified_at"] = time.time()
+        sub["lease_expires"] = sub["verified_at"] + lease
+        self.save()
+        logging.info(f"[WebSub] Subscribed to {feed_url} via {sub['hub']} for {lease}s")
+        return web.Response(text=challenge)
+
+    async def handle_content(self, request):
+        feed_url, sub = self.find_subscription(request.match_info["callback_id"])
+        if sub is None:
+            return web.Response(status=410)  # Tells the hub to drop a subscription we no longer have
+        body = await request.read()
+        # Unsigned or badly signed pushes are acknowledged but ignored, as the spec requires
+        algorithm, _, signature = request.headers.get("X-Hub-Signature", "").partition("=")
+        if algorithm not in ("sha1", "sha256", "sha384", "sha512") or not hmac.compare_digest(
+            hmac.new(sub["secret"].encode(), body, algorithm).hexdigest(), signature
+        ):
+            logging.warning(f"[WebSub] Ignoring push for {feed_url} with a missing or invalid signature")
+            return web.Response(status=202)
+        # Processing fetches article images and may wait on the database; a hub that times out pushes again
+        task = asyncio.create_task(self.process_push(feed_url, body.decode(request.charset or "utf-8", errors="replace")))
+        self.push_tasks.add(task)
+        task.add_done_callback(self.push_tasks.discard)
+        return web.Response(status=202)
+
+    async def process_push(self, feed_url, content):
+        try:
+            await self.on_content(feed_url, content)
+        except Exception as e:
+            logging.error(f"[WebSub] Processing a push for {feed_url} failed: {type(e).__name__} - {e}")
+
+    async def start_server(self, host=WEBSUB_HOST, port=WEBSUB_PORT, max_body=2 * 1024 * 1024):
+        app = web.Application(client_max_size=max_body)
+        app.router.add_get(f"/{WORKER_INDEX}/{{callback_id}}", self.handle_verify)
+        app.router.add_post(f"/{WORKER_INDEX}/{{callback_id}}", self.handle_content)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logging.info(f"[WebSub] Callback server listening on {host}:{port}, public URL {self.callback_base}")
+        return runner
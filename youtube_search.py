@@ -0,0 +1,76 @@
+import json
+import re
+
+def normalize_youtube_query(query):
+    """Cache key for a handle, channel URL or free-text query."""
+    query = query.strip()
+    m = re.match(r"https?://(?:www\.|m\.)?youtube\.com/@([\w.-]+)", query)
+    if m:
+        query = m.group(1)
+    return " ".join(query.lstrip("@").split()).lower()
+
+def extract_yt_initial_data(html):
+    """Decode the ytInitialData object, stopping at its closing brace instead of scanning the page."""
+    m = re.search(r'ytInitialData"?\]?\s*=\s*(?=\{)', html)
+    if not m:
+        raise ValueError(" Could not find ytInitialData JSON on page")
+    try:
+        data, _ = json.JSONDecoder().raw_decode(html, m.end())
+    except json.JSONDecodeError as e:
+        raise ValueError(f" Failed to parse ytInitialData JSON: {e}")
+    return data
+
+def parse_channel_results(data):
+    """(name, url, channel_id, description, avatar) for each channel in a search results page."""
+    channels = []
+
+    try:
+        sections = data.get('contents', {}) \
+                       .get('twoColumnSearchResultsRenderer', {}) \
+                       .get('primaryContents', {}) \
+                       .get('sectionListRenderer', {}) \
+                       .get('contents', [])
+
+        for section in sections:
+            item_section = section.get('itemSectionRenderer', {})
+            items = item_section.get('contents', [])
+            for item in items:
+                channel = item.get('channelRenderer')
+                if channel:
+                    name = None
+                    title_obj = channel.get('title')
+                    if title_obj:
+                        runs = title_obj.get('runs')
+                        if runs and len(runs) > 0:
+                            name = runs[0].get('text')
+                        else:
+                            name = title_obj.get('simpleText')
+                    if not name:
+                        continue
+
+                    channel_id = channel.get('channelId')
+
+                    url = None
+                    if 'navigationEndpoint' in channel and 'browseEndpoint' in channel['navigationEndpoint']:
+                        browse = channel['navigationEndpoint']['browseEndpoint']
+                        if 'canonicalBaseUrl' in browse:
+                            url = "https://www.youtube.com" + browse['canonicalBaseUrl']
+                        elif 'browseId' in browse:
+                            url = "https://www.youtube.com/channel/" + browse['browseId']
+                    if not url and channel_id:
+                        url = f"https://www.youtube.com/channel/{channel_id}"
+
+                    desc_runs = channel.get('descriptionSnippet', {}).get('runs', [])
+                    description = ''.join([run.get('text', '') for run in desc_runs]) if desc_runs else "No description available."
+
+                    thumbnails = channel.get('thumbnail', {}).get('thumbnails', [])
+                    avatar = thumbnails[-1].get('url') if thumbnails else None
+                    if avatar and avatar.startswith('//'):
+                        avatar = "https:" + avatar
+
+                    channels.append((name, url, channel_id, description, avatar))
+
+    except Exception as e:
+        raise ValueError(f" Failed parsing channels JSON: {e}")
+
+    return channels